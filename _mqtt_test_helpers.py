@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Shared MQTT client setup for the standalone test scripts.
+"""
+
+import socket
+import time
+import paho.mqtt.client as mqtt
+
+
+def _tune_socket(client, userdata, sock):
+    """Disable Nagle and enable TCP keepalive on the broker socket."""
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    except (AttributeError, OSError):
+        pass  # Not a plain TCP socket (e.g. websockets)
+
+
+def make_client(client_id: str, username: str, password: str) -> mqtt.Client:
+    """
+    Create an MQTT client with credentials and socket tuning applied.
+
+    Args:
+        client_id: MQTT client ID (empty string for a random one)
+        username: Broker username
+        password: Broker password
+
+    Returns:
+        Configured paho-mqtt client; callbacks are left to the caller
+    """
+    client = mqtt.Client(client_id=client_id, clean_session=True)
+    client.username_pw_set(username, password)
+    client.on_socket_open = _tune_socket
+    return client
+
+
+def loop_until(client: mqtt.Client, timeout: float, event=None) -> bool:
+    """
+    Run the client's network loop on this thread until event is set or timeout elapses.
+
+    Callbacks run on the calling thread, so no loop_start() thread is needed.
+
+    Args:
+        client: Connected paho-mqtt client
+        timeout: Maximum time to loop in seconds
+        event: Optional threading.Event that ends the loop early when set
+
+    Returns:
+        True if event was set, False on timeout or connection loss
+    """
+    deadline = time.monotonic() + timeout
+    while not (event is not None and event.is_set()):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        if client.loop(timeout=min(remaining, 1.0)) != mqtt.MQTT_ERR_SUCCESS:
+            break  # Connection lost; callbacks have already run
+    return event is not None and event.is_set()
@@ -34,6 +34,7 @@ class Config:
         self.PRINTER_NAME = os.getenv("PRINTER_NAME", "gobbler_80mm_Series")
         self.PRINTER_VENDOR_ID = os.getenv("PRINTER_VENDOR_ID", "0x04b8")
         self.PRINTER_PRODUCT_ID = os.getenv("PRINTER_PRODUCT_ID", "0x0202")
+        self.PRINTER_CUT_MODE = os.getenv("PRINTER_CUT_MODE", "full")  # full or partial
 
         # System Configuration
         mac_address = os.getenv("MAC_ADDRESS", "auto")
@@ -13,7 +13,7 @@ from datetime import datetime
 from .config import config
 from .utils.logger import logger
 from .printer_manager import printer_manager
-from .utils.formatting import replace_variables
+from .utils.formatting import prepare_order_variables, replace_order_variables
 
 
 class MQTTClient:
@@ -286,17 +286,20 @@ class MQTTClient:
         """
         processed_data = []
 
+        # Order-level values are the same for every line; resolve them once
+        variables = prepare_order_variables(print_data)
+
         for element in receipt_data:
             if isinstance(element, str):
                 # Replace variables in text
-                processed_text = replace_variables(element, print_data)
+                processed_text = replace_order_variables(element, variables)
                 processed_data.append(processed_text)
             elif isinstance(element, dict):
                 # Process dictionary elements
                 processed_element = {}
                 for key, value in element.items():
                     if isinstance(value, str):
-                        processed_element[key] = replace_variables(value, print_data)
+                        processed_element[key] = replace_order_variables(value, variables)
                     else:
                         processed_element[key] = value
                 processed_data.append(processed_element)
@@ -3,17 +3,32 @@ USB Printer Manager for SD MQTT Printer Mac client.
 Handles USB thermal printer communication with ESC/POS commands.
 """
 
+import re
 import time
+import struct
+import logging
+import queue
+import threading
 from typing import Dict, Any, Optional, List, Tuple
 from escpos.printer import Usb, Dummy
 from escpos.exceptions import USBNotFoundError, Error as ESCPOSError
 import subprocess
 import platform
 
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; pure-Python fallbacks are used without it
+    np = None
+
+try:
+    import cups
+except ImportError:  # pycups is optional; the lpstat CLI is used without it
+    cups = None
+
 from .config import config
 from .utils.logger import logger
 from .utils.formatting import PrinterFormatter, parse_line_command, parse_qr_command, generate_line_pattern, replace_variables
-from .utils.bitmap import decode_bit_packed_bitmap, convert_bitmap_to_escpos
+from .utils.bitmap import decode_bit_packed_bitmap, convert_bitmap_to_escpos, create_dotted_line_bitmap
 from .qr_generator import qr_generator
 
 
@@ -29,6 +44,103 @@ class PrinterStatus:
     OFFLINE = "offline"
 
 
+# Receipt object keys in dispatch precedence order (like ESP32 firmware processing order)
+_DICT_KEY_ORDER = ("page", "f", "m", "line", "qr_bitmap", "qr_image_url", "qr_url", "qr")
+
+# Alignment lookups: ESP32 format code -> formatter code, formatter code -> escpos name, and back
+_ALIGN_MAP = {"c": "C", "C": "C", "l": "L", "L": "L", "r": "R", "R": "R"}
+_ALIGN_NAMES = {"C": "center", "R": "right"}
+_ALIGN_CODES = {"center": "C", "right": "R"}
+
+# CUPS printer names that look like thermal receipt printers (used by auto-detection)
+_THERMAL_RE = re.compile(r'thermal|receipt|pos|80mm', re.IGNORECASE)
+
+# IPP printer-state value for a stopped (disabled) queue
+_CUPS_STATE_STOPPED = 5
+
+# Seconds a successful printer listing is reused for
+_PRINTER_LIST_TTL = 5.0
+
+# GS v 0 m xL xH yL yH raster header: width in bytes and height in dots as little-endian uint16
+_pack_raster_header = struct.Struct("<4BHH").pack
+_FEED_ONE_LINE = b"\x1bd\x01"  # ESC d 1 = 1 line feed
+
+# DC2 * r n bitmap header: height in dots, width in bytes
+_pack_dc2_header = struct.Struct("4B").pack
+
+# bytes.translate table flipping every bit of a byte
+_INVERT_BYTE = bytes(0xFF - value for value in range(256))
+
+# Shared pycups connection, created on first use and dropped after an error
+_cups_connection = None
+_cups_lock = threading.Lock()
+
+
+def _with_cups_connection(action):
+    """
+    Run an action against the shared pycups connection.
+
+    A failed call drops the cached connection so the next call reconnects
+    (e.g. after cupsd restarts).
+
+    Args:
+        action: Callable taking a cups.Connection
+
+    Returns:
+        Whatever action returns
+    """
+    global _cups_connection
+    with _cups_lock:
+        try:
+            if _cups_connection is None:
+                _cups_connection = cups.Connection()
+            return action(_cups_connection)
+        except Exception:
+            _cups_connection = None
+            raise
+
+
+class DeviceWriter:
+    """
+    Background writer that streams rendered ESC/POS chunks to a printer device.
+    The bounded queue lets a print job render a few elements ahead of the device.
+    """
+
+    def __init__(self, device, max_pending: int = 4):
+        self.device = device
+        self.error = None
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._thread = threading.Thread(target=self._run, name="printer-writer", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        """Write queued chunks until the end-of-job marker (None) arrives."""
+        while True:
+            chunk = self._queue.get()
+            if chunk is None:
+                return
+            if self.error is None:
+                try:
+                    self.device._raw(chunk)
+                except Exception as e:
+                    # Keep draining so the producer never blocks on a dead device
+                    self.error = e
+
+    def put(self, chunk: bytes):
+        """Queue a chunk for the device, raising any earlier write error."""
+        if self.error is not None:
+            raise self.error
+        if chunk:
+            self._queue.put(chunk)
+
+    def close(self, raise_error: bool = True):
+        """Wait for all queued chunks to be written."""
+        self._queue.put(None)
+        self._thread.join()
+        if raise_error and self.error is not None:
+            raise self.error
+
+
 class USBPrinterManager:
     """
     USB thermal printer manager with ESP32 firmware compatibility.
@@ -37,12 +149,29 @@ class USBPrinterManager:
 
     def __init__(self):
         self.printer = None
+        # Printer the current job renders into (a Dummy when a DeviceWriter feeds the device)
+        self._render_target = None
         self.is_connected = False
         self.formatter = PrinterFormatter()
         self.last_status_check = 0
         self.status_check_interval = 30  # seconds
+
+        # (timestamp, printers) of the last successful CUPS printer listing
+        self._printers_cache = None
         self.current_status = PrinterStatus.OFFLINE
 
+        # Last (align, bold, size) sent to the printer, to skip redundant format commands
+        self._last_applied_format = None
+
+        # USB vendor/product IDs parsed once from config (None if misconfigured)
+        try:
+            self._vendor_id = int(config.PRINTER_VENDOR_ID, 16)
+            self._product_id = int(config.PRINTER_PRODUCT_ID, 16)
+        except (TypeError, ValueError) as e:
+            logger.debug(f"🔍 Invalid printer vendor/product ID: {str(e)}")
+            self._vendor_id = None
+            self._product_id = None
+
         # Error state tracking
         self.error_states = {
             "paper_out": False,
@@ -61,6 +190,18 @@ class USBPrinterManager:
             "last_print_time": None,
         }
 
+        # Receipt object handlers, keyed by the element key they handle
+        self._dict_handlers = {
+            "page": self._handle_page,
+            "f": self._apply_short_format,
+            "m": self._handle_meta,
+            "line": self._print_line,
+            "qr_bitmap": self._handle_qr_bitmap,
+            "qr_image_url": self._handle_qr_image_url,
+            "qr_url": self._handle_qr_url,
+            "qr": self._handle_legacy_qr,
+        }
+
     def connect(self) -> bool:
         """
         Connect to USB thermal printer.
@@ -71,8 +212,11 @@ class USBPrinterManager:
         try:
             logger.info(f"🔌 Connecting to USB printer: {config.PRINTER_NAME}")
 
+            # One printer listing is shared by the name and auto-detect paths
+            printers = self._list_printers()
+
             # Try to connect using printer name first
-            if self._connect_by_name():
+            if self._connect_by_name(printers):
                 return True
 
             # Try to connect using vendor/product ID
@@ -80,7 +224,7 @@ class USBPrinterManager:
                 return True
 
             # Try to find any available thermal printer
-            if self._connect_auto_detect():
+            if self._connect_auto_detect(printers):
                 return True
 
             logger.error("❌ Failed to connect to any USB printer")
@@ -90,13 +234,55 @@ class USBPrinterManager:
             logger.error(f"❌ Printer connection error: {str(e)}")
             return False
 
-    def _connect_by_name(self) -> bool:
+    def _list_printers(self) -> Dict[str, bool]:
+        """
+        List printers known to CUPS.
+
+        Queries CUPS in-process through pycups when it is installed, otherwise
+        parses a single `lpstat -p` call. Successful listings are reused for a
+        few seconds so reconnect bursts and status polls don't re-query CUPS.
+
+        Returns:
+            Mapping of printer name to whether it is enabled (empty on failure)
+        """
+        now = time.monotonic()
+        if self._printers_cache and now - self._printers_cache[0] < _PRINTER_LIST_TTL:
+            return self._printers_cache[1]
+
+        printers = None
+        if cups is not None:
+            try:
+                printers = {
+                    name: attrs.get('printer-state') != _CUPS_STATE_STOPPED
+                    for name, attrs in _with_cups_connection(lambda conn: conn.getPrinters()).items()
+                }
+            except Exception as e:
+                logger.debug(f"🔍 CUPS printer query failed, falling back to lpstat: {str(e)}")
+
+        if printers is None:
+            try:
+                result = subprocess.run(['lpstat', '-p'], capture_output=True, text=True)
+                if result.returncode == 0:
+                    printers = {}
+                    for line in result.stdout.strip().split('\n'):
+                        parts = line.split()
+                        if len(parts) >= 2 and parts[0] == 'printer':
+                            printers[parts[1]] = 'enabled' in line
+            except Exception as e:
+                logger.debug(f"🔍 Printer listing failed: {str(e)}")
+
+        # Only successful listings are cached; failures are retried on the next call
+        if printers is None:
+            self._printers_cache = None
+            return {}
+
+        self._printers_cache = (now, printers)
+        return printers
+
+    def _connect_by_name(self, printers: Dict[str, bool]) -> bool:
         """Connect using printer name."""
         try:
-            # Use lp command to print to named printer
-            result = subprocess.run(['lpstat', '-p', config.PRINTER_NAME],
-                                  capture_output=True, text=True)
-            if result.returncode == 0:
+            if config.PRINTER_NAME in printers:
                 # Printer exists, create a wrapper
                 self.printer = NamedPrinterWrapper(config.PRINTER_NAME)
                 self.is_connected = True
@@ -110,14 +296,14 @@ class USBPrinterManager:
 
     def _connect_by_ids(self) -> bool:
         """Connect using vendor/product IDs."""
-        try:
-            vendor_id = int(config.PRINTER_VENDOR_ID, 16)
-            product_id = int(config.PRINTER_PRODUCT_ID, 16)
+        if self._vendor_id is None or self._product_id is None:
+            return False
 
-            self.printer = Usb(vendor_id, product_id)
+        try:
+            self.printer = Usb(self._vendor_id, self._product_id)
             self.is_connected = True
             self.current_status = PrinterStatus.READY
-            logger.info(f"✅ Connected to USB printer: {vendor_id:04x}:{product_id:04x}")
+            logger.info(f"✅ Connected to USB printer: {self._vendor_id:04x}:{self._product_id:04x}")
             return True
 
         except (USBNotFoundError, ValueError) as e:
@@ -125,25 +311,19 @@ class USBPrinterManager:
 
         return False
 
-    def _connect_auto_detect(self) -> bool:
+    def _connect_auto_detect(self, printers: Dict[str, bool]) -> bool:
         """Auto-detect and connect to available thermal printer."""
         try:
-            # List available printers
-            result = subprocess.run(['lpstat', '-p'], capture_output=True, text=True)
-            if result.returncode == 0:
-                lines = result.stdout.strip().split('\n')
-                for line in lines:
-                    if 'printer' in line and 'enabled' in line:
-                        printer_name = line.split()[1]
-                        if any(keyword in printer_name.lower() for keyword in ['thermal', 'receipt', 'pos', '80mm']):
-                            try:
-                                self.printer = NamedPrinterWrapper(printer_name)
-                                self.is_connected = True
-                                self.current_status = PrinterStatus.READY
-                                logger.info(f"✅ Auto-detected printer: {printer_name}")
-                                return True
-                            except Exception:
-                                continue
+            for printer_name, enabled in printers.items():
+                if enabled and _THERMAL_RE.search(printer_name):
+                    try:
+                        self.printer = NamedPrinterWrapper(printer_name)
+                        self.is_connected = True
+                        self.current_status = PrinterStatus.READY
+                        logger.info(f"✅ Auto-detected printer: {printer_name}")
+                        return True
+                    except Exception:
+                        continue
         except Exception as e:
             logger.debug(f"🔍 Auto-detection failed: {str(e)}")
 
@@ -174,132 +354,81 @@ class USBPrinterManager:
         """
         Print receipt data with formatting support.
         Processes JSON elements exactly like ESP32 firmware.
+
+        Direct (USB) printers are fed by a background writer: each element is
+        rendered into a Dummy printer and its bytes are queued for the device,
+        so the next element is prepared while the previous one is written.
         """
+        device = self.printer
+        writer = None
+        # Checked once per job so per-element debug messages cost nothing when disabled
+        debug = logger.isEnabledFor(logging.DEBUG)
         try:
-            logger.debug(f"🖨️ Starting receipt print", elements=len(receipt_data))
+            logger.debug("🖨️ Starting receipt print", elements=len(receipt_data))
+
+            # Render into a job-local target; self.printer is left to connect/disconnect
+            if device is not None and not isinstance(device, NamedPrinterWrapper):
+                writer = DeviceWriter(device)
+                self._render_target = Dummy()
+            else:
+                self._render_target = device
+                if device is not None:
+                    # Send the wrapper's lazy ESC @ reset now; if the first text() sent it,
+                    # it would silently undo the format cached in _last_applied_format
+                    device.init()
 
             # Initialize formatting state for new print job (like ESP32 firmware)
             self.formatter.reset_formatting()
             
             # Apply initial formatting to printer (like ESP32 firmware initialization)
+            self._last_applied_format = None
             self._apply_current_format()
             logger.debug("🎨 Format state initialized for new print job")
 
             # Process each element exactly like ESP32 firmware
-            qr_already_printed = False
-            last_order_id = ""
-            current_page = 1
-            total_pages = 1
+            self._qr_already_printed = False
+            self._last_order_id = ""
+            self._current_page = 1
+            self._total_pages = 1
+
+            # Bound lookups hoisted out of the per-element loop
+            handlers = self._dict_handlers
+            print_text_line = self._print_text_line
+            output = self._render_target
             
             for i, element in enumerate(receipt_data):
-                logger.debug(f"🔍 Processing element {i}: {type(element)}")
+                if debug:
+                    logger.debug(f"🔍 Processing element {i}: {type(element)}")
                 
-                # Handle JSON objects (formatting and metadata)
+                # Handle JSON objects (formatting, metadata, lines and QR codes)
                 if isinstance(element, dict):
-                    # Check for page metadata (like ESP32 firmware)
-                    if "page" in element and "of" in element:
-                        current_page = element.get("page", 1)
-                        total_pages = element.get("of", 1)
-                        logger.debug(f"📄 Page metadata: {current_page}/{total_pages}")
-                        continue  # Skip printing this meta line
-                    
-                    # Apply formatting if present (like ESP32 applyShortFormat)
-                    if "f" in element:
-                        self._apply_short_format(element)
-                        continue  # Skip to next element after applying format
-                    
-                    # Extract order ID from metadata
-                    if "m" in element and "order_id" in element["m"]:
-                        last_order_id = element["m"]["order_id"]
-                        logger.debug(f"📋 Order ID extracted: {last_order_id}")
-                        continue  # Skip to next element after extracting metadata
-                    
-                    # Handle line elements (MISSING LOGIC - this is why lines weren't printing!)
-                    if "line" in element:
-                        logger.debug(f"📏 Line element detected: {element}")
-                        self._print_line(element)
-                        continue  # Skip to next element after printing line
-                    
-                    # Handle QR codes (like ESP32 firmware QR processing)
-                    if not qr_already_printed:
-                        if "qr_bitmap" in element:
-                            logger.debug("🔲 QR bitmap detected - converting to built-in QR")
-                            qr_url = f"https://scandeer.com/order/{last_order_id}"
-                            qr_size = element.get("qr_size", 10)
-                            qr_align = element.get("qr_alignment", "center")
-                            qr_data = {
-                                "url": qr_url,
-                                "size": qr_size,
-                                "alignment": qr_align,
-                                "type": "url"
-                            }
-                            self._print_qr_code(qr_data)
-                            qr_already_printed = True
-                            continue
-                        elif "qr_image_url" in element:
-                            logger.debug("🖼️ QR image URL detected")
-                            qr_url = element["qr_image_url"]
-                            qr_size = element.get("qr_size", 10)
-                            qr_align = element.get("qr_alignment", "center")
-                            qr_data = {
-                                "url": qr_url,
-                                "size": qr_size,
-                                "alignment": qr_align,
-                                "type": "url"
-                            }
-                            self._print_qr_code(qr_data)
-                            qr_already_printed = True
-                            continue
-                        elif "qr_url" in element:
-                            logger.debug("🌐 QR URL detected")
-                            qr_data = {
-                                "url": element["qr_url"],
-                                "size": element.get("qr_size", 10),
-                                "alignment": element.get("qr_alignment", "center"),
-                                "type": "url"
-                            }
-                            self._print_qr_code(qr_data)
-                            qr_already_printed = True
-                            continue
-                        elif "qr" in element:
-                            logger.debug("🔲 Legacy QR detected")
-                            if isinstance(element["qr"], str):
-                                qr_data = {
-                                    "text": element["qr"],
-                                    "url": element["qr"],
-                                    "size": 10,
-                                    "alignment": "center",
-                                    "type": "url"
-                                }
-                                self._print_qr_code(qr_data)
-                            elif isinstance(element["qr"], dict):
-                                qr_obj = element["qr"]
-                                # Set defaults for missing fields
-                                qr_data = {
-                                    "text": qr_obj.get("text", qr_obj.get("url", "")),
-                                    "url": qr_obj.get("url", qr_obj.get("text", "")),
-                                    "size": qr_obj.get("size", 10),
-                                    "alignment": qr_obj.get("alignment", "center"),
-                                    "type": qr_obj.get("type", "url")
-                                }
-                                self._print_qr_code(qr_data)
-                            qr_already_printed = True
-                            continue
+                    # Dispatch on the first recognized key; handlers return False to decline
+                    for key in _DICT_KEY_ORDER:
+                        if key in element and handlers[key](element) is not False:
+                            break
                 
                 # Handle text strings (like ESP32 firmware text processing)
                 elif isinstance(element, str):
                     # Filter QR URL text (like ESP32 firmware)
                     if element.startswith("QR:"):
-                        logger.debug(f"🚫 Filtered QR URL text: {element}")
+                        if debug:
+                            logger.debug(f"🚫 Filtered QR URL text: {element}")
                         continue  # Skip this line - don't print QR URLs as text
                     
-                    # Apply current persistent formatting before printing text (like ESP32)
-                    self._apply_current_format()
-                    self._print_text_line(element)
-                    logger.debug(f"📝 Text printed with format - Align: {self.formatter.current_align}, Bold: {self.formatter.current_bold}, Size: {self.formatter.current_size}")
+                    # Applies current persistent formatting before printing (like ESP32)
+                    print_text_line(element)
+
+                if writer:
+                    writer.put(output.output)
+                    output.clear()
 
             # Finalize receipt (cut paper, add spacing) - THIS WAS MISSING!
             self._finalize_receipt()
+
+            if writer:
+                writer.put(output.output)
+                writer.close()
+                writer = None
             
             # Flush any remaining print data
             self._flush_print_job()
@@ -313,6 +442,87 @@ class USBPrinterManager:
             logger.error(f"❌ Stack trace: {traceback.format_exc()}")
             return False
 
+        finally:
+            if writer:
+                writer.close(raise_error=False)
+            self._render_target = None
+
+    def _handle_page(self, element: dict) -> bool:
+        """Record page metadata (like ESP32 firmware); the meta line is not printed."""
+        if "of" not in element:
+            return False
+        self._current_page = element.get("page", 1)
+        self._total_pages = element.get("of", 1)
+        logger.debug(f"📄 Page metadata: {self._current_page}/{self._total_pages}")
+        return True
+
+    def _handle_meta(self, element: dict) -> bool:
+        """Extract order ID from metadata."""
+        if "order_id" not in element["m"]:
+            return False
+        self._last_order_id = element["m"]["order_id"]
+        logger.debug(f"📋 Order ID extracted: {self._last_order_id}")
+        return True
+
+    def _handle_qr_bitmap(self, element: dict):
+        """Print QR bitmap element as built-in QR for the current order."""
+        if self._qr_already_printed:
+            return
+        logger.debug("🔲 QR bitmap detected - converting to built-in QR")
+        self._print_qr_for_element(f"https://scandeer.com/order/{self._last_order_id}", element)
+
+    def _handle_qr_image_url(self, element: dict):
+        """Print QR image URL element."""
+        if self._qr_already_printed:
+            return
+        logger.debug("🖼️ QR image URL detected")
+        self._print_qr_for_element(element["qr_image_url"], element)
+
+    def _handle_qr_url(self, element: dict):
+        """Print QR URL element."""
+        if self._qr_already_printed:
+            return
+        logger.debug("🌐 QR URL detected")
+        self._print_qr_for_element(element["qr_url"], element)
+
+    def _handle_legacy_qr(self, element: dict):
+        """Print legacy QR element (string or object)."""
+        if self._qr_already_printed:
+            return
+        logger.debug("🔲 Legacy QR detected")
+        if isinstance(element["qr"], str):
+            qr_data = {
+                "text": element["qr"],
+                "url": element["qr"],
+                "size": 10,
+                "alignment": "center",
+                "type": "url"
+            }
+            self._print_qr_code(qr_data)
+        elif isinstance(element["qr"], dict):
+            qr_obj = element["qr"]
+            # Set defaults for missing fields
+            qr_data = {
+                "text": qr_obj.get("text", qr_obj.get("url", "")),
+                "url": qr_obj.get("url", qr_obj.get("text", "")),
+                "size": qr_obj.get("size", 10),
+                "alignment": qr_obj.get("alignment", "center"),
+                "type": qr_obj.get("type", "url")
+            }
+            self._print_qr_code(qr_data)
+        self._qr_already_printed = True
+
+    def _print_qr_for_element(self, qr_url: str, element: dict):
+        """Print a URL QR code using the element's qr_size/qr_alignment (only once per receipt)."""
+        qr_data = {
+            "url": qr_url,
+            "size": element.get("qr_size", 10),
+            "alignment": element.get("qr_alignment", "center"),
+            "type": "url"
+        }
+        self._print_qr_code(qr_data)
+        self._qr_already_printed = True
+
     def _apply_short_format(self, element: dict):
         """
         Apply short format changes exactly like ESP32 firmware applyShortFormat.
@@ -325,22 +535,18 @@ class USBPrinterManager:
             
         fmt = element["f"]
         changes = {}
+        debug = logger.isEnabledFor(logging.DEBUG)
         
         # Handle alignment (like ESP32 firmware)
         if "a" in fmt:
-            align_char = fmt["a"]
             # Handle both uppercase and lowercase alignment codes (like ESP32)
-            if align_char.lower() == 'c':
-                align_char = 'C'
-            elif align_char.lower() == 'l':
-                align_char = 'L'
-            elif align_char.lower() == 'r':
-                align_char = 'R'
+            align_char = _ALIGN_MAP.get(fmt["a"], fmt["a"])
             
             if align_char != self.formatter.current_align:
                 self.formatter.current_align = align_char
                 changes["align"] = align_char
-                logger.debug(f"🎨 Format: Alignment changed to {align_char}")
+                if debug:
+                    logger.debug(f"🎨 Format: Alignment changed to {align_char}")
         
         # Handle bold (like ESP32 firmware)
         if "b" in fmt:
@@ -348,7 +554,8 @@ class USBPrinterManager:
             if bold_val != self.formatter.current_bold:
                 self.formatter.current_bold = bold_val
                 changes["bold"] = bold_val
-                logger.debug(f"🎨 Format: Bold changed to {'ON' if bold_val else 'OFF'}")
+                if debug:
+                    logger.debug(f"🎨 Format: Bold changed to {'ON' if bold_val else 'OFF'}")
         
         # Handle size (like ESP32 firmware)
         if "s" in fmt:
@@ -356,7 +563,8 @@ class USBPrinterManager:
             if size_val != self.formatter.current_size:
                 self.formatter.current_size = size_val
                 changes["size"] = size_val
-                logger.debug(f"🎨 Format: Size changed to {size_val}")
+                if debug:
+                    logger.debug(f"🎨 Format: Size changed to {size_val}")
         
         # Apply changes to printer immediately (like ESP32 firmware)
         if changes:
@@ -365,45 +573,47 @@ class USBPrinterManager:
     def _apply_current_format(self):
         """
         Apply current persistent formatting state to printer (like ESP32 applyCurrentFormat).
+        Skipped when the state is unchanged since the last application.
         """
+        format_key = (self.formatter.current_align, self.formatter.current_bold, self.formatter.current_size)
+        if format_key == self._last_applied_format:
+            return
+        self._last_applied_format = format_key
+
         # Set alignment
-        if self.formatter.current_align == 'C':
-            self.printer.set_with_default(align='center')
-        elif self.formatter.current_align == 'R':
-            self.printer.set_with_default(align='right')
-        else:
-            self.printer.set_with_default(align='left')
+        self._render_target.set_with_default(align=_ALIGN_NAMES.get(self.formatter.current_align, 'left'))
 
         # Set bold
         if self.formatter.current_bold:
-            self.printer.set_with_default(bold=True)
+            self._render_target.set_with_default(bold=True)
         else:
-            self.printer.set_with_default(bold=False)
+            self._render_target.set_with_default(bold=False)
 
         # Set size
         if self.formatter.current_size == 2:
-            self.printer.set_with_default(double_height=True, double_width=True)
+            self._render_target.set_with_default(double_height=True, double_width=True)
         elif self.formatter.current_size == 0:
-            self.printer.set_with_default(double_height=False, double_width=False, width=1, height=1)
+            self._render_target.set_with_default(double_height=False, double_width=False, width=1, height=1)
         else:
-            self.printer.set_with_default(double_height=False, double_width=False)
+            self._render_target.set_with_default(double_height=False, double_width=False)
 
     def _print_text_line(self, text: str):
         """Print a text line with current formatting (like ESP32 firmware)."""
         if not text:
-            # Empty line
-            self.printer.text("\n")
+            # Empty line: a bare LF is alignment-agnostic, so no format commands are sent
+            self._render_target.text("\n")
             return
 
         # Apply current persistent formatting state (like ESP32 applyCurrentFormat())
         self._apply_current_format()
         
         # Print text with line ending
-        self.printer.text(text + "\n")
+        self._render_target.text(text + "\n")
         
-        logger.debug(f"📝 Text printed with format - Align: {self.formatter.current_align}, "
-                    f"Bold: {'ON' if self.formatter.current_bold else 'OFF'}, "
-                    f"Size: {self.formatter.current_size}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"📝 Text printed with format - Align: {self.formatter.current_align}, "
+                        f"Bold: {'ON' if self.formatter.current_bold else 'OFF'}, "
+                        f"Size: {self.formatter.current_size}")
 
     def _apply_format(self, format_element: Dict[str, Any]):
         """Apply formatting changes (like ESP32 firmware applyShortFormat)."""
@@ -443,7 +653,7 @@ class USBPrinterManager:
         except Exception as e:
             logger.error(f"Error printing line: {e}")
             # Fallback to simple text line
-            self.printer.text("--------------------------------\n")
+            self._render_target.text("--------------------------------\n")
 
     def _print_solid_line_bitmap(self):
         """Print solid line using ESC/POS bitmap command like ESP32 firmware."""
@@ -456,27 +666,27 @@ class USBPrinterManager:
             
             # Create bitmap data for solid line (all pixels black)
             total_bytes = bytes_per_row * thickness
-            line_data = bytearray([0xFF] * total_bytes)  # 0xFF = all pixels black
+            line_data = b"\xff" * total_bytes  # 0xFF = all pixels black
             
             # Add minimal spacing above (1/2 line using ESC/POS line feed)
-            self.printer._raw(bytes([0x1B, ord('d'), 1]))  # ESC d 1 = 1 line feed
+            self._render_target._raw(_FEED_ONE_LINE)
             
             # Send ESC/POS raster bitmap command: GS v 0
-            cmd = bytes([0x1D, ord('v'), ord('0'), 0, bytes_per_row, 0, thickness, 0])
-            self.printer._raw(cmd)
+            cmd = _pack_raster_header(0x1D, 0x76, 0x30, 0, bytes_per_row, thickness)
+            self._render_target._raw(cmd)
             
             # Send bitmap data
-            self.printer._raw(line_data)
+            self._render_target._raw(line_data)
             
             # Add minimal spacing below (1/2 line using ESC/POS line feed)
-            self.printer._raw(bytes([0x1B, ord('d'), 1]))  # ESC d 1 = 1 line feed
+            self._render_target._raw(_FEED_ONE_LINE)
             
             logger.debug("✅ Solid line printed using ESC/POS bitmap")
             
         except Exception as e:
             logger.error(f"Error printing solid line bitmap: {e}")
             # Fallback to text line
-            self.printer.text("=" * 48 + "\n")
+            self._render_target.text("=" * 48 + "\n")
 
     def _print_dotted_line_bitmap(self):
         """Print dotted line using ESC/POS bitmap command like ESP32 firmware."""
@@ -488,50 +698,38 @@ class USBPrinterManager:
             dot_size = 2      # 2 pixel dots
             spacing = 2       # 2 pixel spacing between dots
             
-            total_bytes = bytes_per_row * dot_size
-            line_data = bytearray([0x00] * total_bytes)  # Start with all white
-            
-            # Create dotted pattern
-            pattern_length = dot_size + spacing
-            for row in range(dot_size):
-                for col in range(bytes_per_row):
-                    byte_index = row * bytes_per_row + col
-                    
-                    # Create pattern: dot_size pixels on, spacing pixels off
-                    for bit in range(8):
-                        pixel_pos = (col * 8 + bit) % pattern_length
-                        if pixel_pos < dot_size:
-                            line_data[byte_index] |= (0x80 >> bit)  # Set bit (black pixel)
+            # Create dotted pattern: dot_size pixels on, spacing pixels off
+            line_data = create_dotted_line_bitmap(dot_size, spacing, bytes_per_row)
             
             # Add minimal spacing above (1/2 line using ESC/POS line feed)
-            self.printer._raw(bytes([0x1B, ord('d'), 1]))  # ESC d 1 = 1 line feed
+            self._render_target._raw(_FEED_ONE_LINE)
             
             # Send ESC/POS raster bitmap command: GS v 0
-            cmd = bytes([0x1D, ord('v'), ord('0'), 0, bytes_per_row, 0, dot_size, 0])
-            self.printer._raw(cmd)
+            cmd = _pack_raster_header(0x1D, 0x76, 0x30, 0, bytes_per_row, dot_size)
+            self._render_target._raw(cmd)
             
             # Send bitmap data
-            self.printer._raw(line_data)
+            self._render_target._raw(line_data)
             
             # Add minimal spacing below (1/2 line using ESC/POS line feed)
-            self.printer._raw(bytes([0x1B, ord('d'), 1]))  # ESC d 1 = 1 line feed
+            self._render_target._raw(_FEED_ONE_LINE)
             
             logger.debug("✅ Dotted line printed using ESC/POS bitmap")
             
         except Exception as e:
             logger.error(f"Error printing dotted line bitmap: {e}")
             # Fallback to text line
-            self.printer.text("." * 24 + " " * 24 + "\n")
+            self._render_target.text("." * 24 + " " * 24 + "\n")
 
     def _print_dashed_line_bitmap(self):
         """Print dashed line using simple text characters as fallback."""
         try:
             logger.debug("📏 Drawing dashed line using text characters")
-            self.printer.text("- " * 24 + "\n")
+            self._render_target.text("- " * 24 + "\n")
             logger.debug("✅ Dashed line printed")
         except Exception as e:
             logger.error(f"Error printing dashed line: {e}")
-            self.printer.text("--------------------------------\n")
+            self._render_target.text("--------------------------------\n")
 
     def _print_qr_code(self, qr_element):
         """Print QR code using the method that works in ESP32 firmware."""
@@ -553,8 +751,8 @@ class USBPrinterManager:
                 
                 if not success:
                     logger.warning("QR code printing failed - printing fallback text")
-                    self.printer.text("QR Code Unavailable\n")
-                    self.printer.text("Contact theater for details\n")
+                    self._render_target.text("QR Code Unavailable\n")
+                    self._render_target.text("Contact theater for details\n")
                 else:
                     logger.debug("✅ QR code printed successfully")
                     
@@ -568,7 +766,7 @@ class USBPrinterManager:
                 success = self._print_qr_code_builtin(qr_url, qr_size, qr_alignment)
                 
                 if not success:
-                    self.printer.text("QR Code Unavailable\n")
+                    self._render_target.text("QR Code Unavailable\n")
                     
             elif "qr" in qr_element:
                 # Legacy QR format
@@ -577,7 +775,7 @@ class USBPrinterManager:
                 success = self._print_qr_code_builtin(qr_data, 10, "center")
                 
                 if not success:
-                    self.printer.text("QR Code Unavailable\n")
+                    self._render_target.text("QR Code Unavailable\n")
                     
             elif "text" in qr_element:
                 # Text-based QR format
@@ -589,15 +787,15 @@ class USBPrinterManager:
                 success = self._print_qr_code_builtin(qr_text, qr_size, qr_alignment)
                 
                 if not success:
-                    self.printer.text("QR Code Unavailable\n")
+                    self._render_target.text("QR Code Unavailable\n")
                     
             else:
                 logger.warning(f"Unknown QR element format: {qr_element}")
-                self.printer.text("QR Code Format Error\n")
+                self._render_target.text("QR Code Format Error\n")
                 
         except Exception as e:
             logger.error(f"Error printing QR code: {e}")
-            self.printer.text("QR Code Error\n")
+            self._render_target.text("QR Code Error\n")
 
     def _print_qr_code_builtin(self, data, size=10, alignment="center"):
         """
@@ -608,26 +806,18 @@ class USBPrinterManager:
             logger.info(f"🔲 Data: {data}")
             
             # Set alignment for QR code
-            if alignment == "center":
-                self.printer.justify('C')
-            elif alignment == "right":
-                self.printer.justify('R')
-            else:
-                self.printer.justify('L')
-            
-            # Use ESC/POS QR commands exactly like ESP32 firmware
-            # This should work without garbled text since it's native printer commands
-            data_bytes = data.encode('utf-8')
-            data_len = len(data_bytes)
+            self._render_target.justify(_ALIGN_CODES.get(alignment, 'L'))
+            # Alignment was changed outside _apply_current_format
+            self._last_applied_format = None
             
             # This printer may not support ESC/POS QR commands via lp
-            # Print URL as text since QR graphics cause issues
+            # Print the full URL as text (never truncated) since QR graphics cause issues
             logger.info("Printing QR as text URL (printer compatibility)")
-            self.printer.text(f"{data}\n")
-            self.printer.text("(Scan with phone camera)\n\n")
+            self._render_target.text(f"{data}\n")
+            self._render_target.text("(Scan with phone camera)\n\n")
             
             # Reset alignment to left
-            self.printer.justify('L')
+            self._render_target.justify('L')
             
             logger.info("✅ ESC/POS QR code printed successfully")
             return True
@@ -642,7 +832,6 @@ class USBPrinterManager:
         """Generate and print actual QR code from URL like ESP32 firmware should do."""
         try:
             import qrcode
-            from PIL import Image
             import io
             
             # Get URL from QR data
@@ -654,61 +843,62 @@ class USBPrinterManager:
             logger.debug(f"🔲 Generating QR code for URL: {url}")
             
             # Create QR code
+            border = 2
             qr = qrcode.QRCode(
                 version=1,
                 error_correction=qrcode.constants.ERROR_CORRECT_L,
                 box_size=3,  # Smaller box size for thermal printer
-                border=2,
+                border=border,
             )
             qr.add_data(url)
             qr.make(fit=True)
             
-            # Create image
-            img = qr.make_image(fill_color="black", back_color="white")
-            
-            # Convert to bitmap for thermal printer
-            # Resize to appropriate size for thermal printer
-            width, height = img.size
-            if width > 200:  # Limit size for thermal printer
-                ratio = 200 / width
-                new_width = int(width * ratio)
-                new_height = int(height * ratio)
-                img = img.resize((new_width, new_height), Image.NEAREST)
-            
-            # Convert to 1-bit bitmap
-            img = img.convert('1')
-            
-            # Convert to bytes for ESC/POS
-            width, height = img.size
-            bytes_per_row = (width + 7) // 8
-            bitmap_data = []
-            
-            # Convert PIL image to bitmap bytes (proper ESC/POS format)
-            for y in range(height):
-                for byte_idx in range(bytes_per_row):
-                    byte_val = 0
-                    for bit in range(8):
-                        x = byte_idx * 8 + bit
-                        if x < width:
-                            pixel = img.getpixel((x, y))
-                            if pixel == 0:  # Black pixel (0 in 1-bit image)
-                                byte_val |= (0x80 >> bit)
-                    bitmap_data.append(byte_val)
+            # Shrink the box size for long URLs so the code fits the 200px limit
+            # with whole, evenly sized modules; at box size 1 even a version 40
+            # code is only 181px, so no resize is ever needed
+            box_size = max(1, min(3, 200 // (qr.modules_count + 2 * border)))
+            qr.box_size = box_size
+            
+            if np is not None:
+                # Render and pack in one pass straight from the module matrix
+                # (border included), skipping the intermediate PIL images
+                modules = np.asarray(qr.get_matrix(), dtype=bool)
+                size = modules.shape[0] * box_size
+                pixel_modules = np.arange(size) // box_size
+                width = height = size
+                raster = np.packbits(modules[np.ix_(pixel_modules, pixel_modules)], axis=1).tobytes()
+            else:
+                # Create image
+                img = qr.make_image(fill_color="black", back_color="white")
+                
+                # Convert to 1-bit bitmap
+                img = img.convert('1')
+                
+                # PIL packs 1-bit images MSB first with 1 = white; invert to 1 = black pixel
+                width, height = img.size
+                bytes_per_row = (width + 7) // 8
+                bitmap_data = bytearray(img.tobytes().translate(_INVERT_BYTE))
+                if width % 8:
+                    # Keep the row padding bits white after inverting
+                    pad_mask = (0xFF << (8 - width % 8)) & 0xFF
+                    for row_end in range(bytes_per_row - 1, len(bitmap_data), bytes_per_row):
+                        bitmap_data[row_end] &= pad_mask
+                raster = bytes(bitmap_data)
             
             # Print bitmap using ESC/POS commands
-            logger.debug(f"🔲 Printing QR bitmap: {width}x{height}, {len(bitmap_data)} bytes")
-            self.printer.print_bitmap(width, height, bytes(bitmap_data))
+            logger.debug(f"🔲 Printing QR bitmap: {width}x{height}, {len(raster)} bytes")
+            self._render_target.print_bitmap(width, height, raster)
             
             logger.debug(f"🔲 Real QR code printed successfully: {width}x{height}")
             return True
             
         except ImportError:
             logger.warning("⚠️ qrcode library not installed, falling back to text")
-            self.printer.text(f"QR: {url}\n")
+            self._render_target.text(f"QR: {url}\n")
             return False
         except Exception as e:
             logger.error(f"❌ QR generation error: {str(e)}")
-            self.printer.text(f"QR: {url}\n")
+            self._render_target.text(f"QR: {url}\n")
             return False
 
     def _print_qr_bitmap(self, qr_data: Dict[str, Any]):
@@ -722,7 +912,7 @@ class USBPrinterManager:
             escpos_data = convert_bitmap_to_escpos(bitmap_data, width, height)
 
             # Send to printer
-            self.printer._raw(escpos_data)
+            self._render_target._raw(escpos_data)
 
         except Exception as e:
             logger.error(f"❌ Bitmap QR print error: {str(e)}")
@@ -740,13 +930,13 @@ class USBPrinterManager:
             logger.debug(f"🔲 Printing QR with ESC/POS command: size={escpos_size}")
             
             # Use the NamedPrinterWrapper QR function directly
-            self.printer.qr(url, size=escpos_size, center=True)
+            self._render_target.qr(url, size=escpos_size, center=True)
 
         except Exception as e:
             logger.error(f"❌ ESC/POS QR print error: {str(e)}")
             # Reliable fallback to text
-            self.printer.text(f"\nQR Code: {url}\n")
-            self.printer.text("(Scan with phone camera)\n\n")
+            self._render_target.text(f"\nQR Code: {url}\n")
+            self._render_target.text("(Scan with phone camera)\n\n")
 
     def _print_qr_url(self, qr_data: Dict[str, Any]):
         """Print QR code from URL using ESC/POS QR command."""
@@ -758,38 +948,38 @@ class USBPrinterManager:
             escpos_size = max(1, min(16, size))
 
             # Use python-escpos QR function
-            self.printer.qr(url, size=escpos_size, center=True)
+            self._render_target.qr(url, size=escpos_size, center=True)
 
         except Exception as e:
             logger.error(f"❌ URL QR print error: {str(e)}")
             # Fallback to text
-            self.printer.text(f"QR: {url}\n")
+            self._render_target.text(f"QR: {url}\n")
 
     def _finalize_receipt(self):
         """Finalize receipt printing."""
         # Add some space
-        self.printer.text("\n\n")
+        self._render_target.text("\n\n")
 
         # Cut paper if supported
         try:
-            if hasattr(self.printer, 'cut'):
-                self.printer.cut()
+            if hasattr(self._render_target, 'cut'):
+                self._render_target.cut()
                 logger.debug("✂️ Paper cut command sent")
             else:
                 logger.debug("⚠️ Cut not supported, adding extra space")
-                self.printer.text("\n\n\n")
+                self._render_target.text("\n\n\n")
         except Exception as e:
             logger.warning(f"⚠️ Cut failed: {str(e)}, adding extra space")
-            self.printer.text("\n\n\n")
+            self._render_target.text("\n\n\n")
 
     def _flush_print_job(self):
         """Flush the print job to the printer."""
         try:
-            if isinstance(self.printer, NamedPrinterWrapper):
+            if isinstance(self._render_target, NamedPrinterWrapper):
                 # For named printers, call close to send buffered data
-                self.printer.close()
+                self._render_target.close()
                 logger.debug("📤 Print job flushed to named printer")
-            elif hasattr(self.printer, 'close'):
+            elif hasattr(self._render_target, 'close'):
                 # For USB printers, close might also flush
                 # But we don't want to close the connection, just flush
                 pass  # USB printers typically auto-flush
@@ -843,9 +1033,8 @@ class USBPrinterManager:
                 self.current_status = PrinterStatus.READY
             else:
                 # For named printers, check if printer queue is available
-                result = subprocess.run(['lpstat', '-p', config.PRINTER_NAME],
-                                      capture_output=True, text=True)
-                if result.returncode == 0 and 'enabled' in result.stdout:
+                # (cached CUPS listing; pycups when installed, else lpstat)
+                if self._list_printers().get(config.PRINTER_NAME):
                     self.current_status = PrinterStatus.READY
                 else:
                     self.current_status = PrinterStatus.OFFLINE
@@ -894,10 +1083,26 @@ class NamedPrinterWrapper:
     GS = 0x1D
     LF = 0x0A
     CR = 0x0D
+
+    # Preformatted static commands
+    INIT = b"\x1b@"                # ESC @
+    ALIGN_LEFT = b"\x1ba\x00"      # ESC a 0
+    ALIGN_CENTER = b"\x1ba\x01"    # ESC a 1
+    ALIGN_RIGHT = b"\x1ba\x02"     # ESC a 2
+    BOLD_ON = b"\x1bE\x01"         # ESC E 1
+    BOLD_OFF = b"\x1bE\x00"        # ESC E 0
+    SIZE_NORMAL = b"\x1d!\x00"     # GS ! 0
+    SIZE_DOUBLE = b"\x1d!\x11"     # GS ! 0x11 (double width and height)
+    FONT_A = b"\x1bM\x00"          # ESC M 0
+    FONT_B = b"\x1bM\x01"          # ESC M 1
+    LINE_FEED = b"\n"              # LF
+    CUT_FULL = b"\x1dV\x00"        # GS V 0
+    CUT_PARTIAL = b"\x1dV\x01"     # GS V 1
     
     def __init__(self, printer_name: str):
         self.printer_name = printer_name
-        self._buffer = b""
+        self.cut_mode = config.PRINTER_CUT_MODE  # 'full' or 'partial'
+        self._buffer = bytearray()  # Grown in place; bytes concatenation would copy on every write
         
         # Track formatting state like ESP32 firmware
         self.current_align = 'L'  # L=Left, C=Center, R=Right
@@ -915,7 +1120,7 @@ class NamedPrinterWrapper:
             return
             
         # ESC @ - Initialize printer
-        self._raw(bytes([self.ESC, 0x40]))
+        self._raw(self.INIT)
         
         # Set default formatting
         self.justify('L')
@@ -933,7 +1138,7 @@ class NamedPrinterWrapper:
             
         # Convert text and handle line endings properly
         text_bytes = text.encode('utf-8')
-        self._buffer += text_bytes
+        self._buffer.extend(text_bytes)
 
     def set_with_default(self, **kwargs):
         """Set formatting based on kwargs (compatible with python-escpos)."""
@@ -982,11 +1187,11 @@ class NamedPrinterWrapper:
             
             # ESC a n - Set justification
             if alignment == 'C':
-                self._raw(bytes([self.ESC, ord('a'), 0x01]))  # Center
+                self._raw(self.ALIGN_CENTER)
             elif alignment == 'R':
-                self._raw(bytes([self.ESC, ord('a'), 0x02]))  # Right
+                self._raw(self.ALIGN_RIGHT)
             else:
-                self._raw(bytes([self.ESC, ord('a'), 0x00]))  # Left
+                self._raw(self.ALIGN_LEFT)
 
     def set_alignment(self, alignment: str):
         """Set alignment using common names (for QR code compatibility)."""
@@ -1004,14 +1209,14 @@ class NamedPrinterWrapper:
         if not self.current_bold:
             self.current_bold = True
             # ESC E 1 - Turn on bold
-            self._raw(bytes([self.ESC, ord('E'), 0x01]))
+            self._raw(self.BOLD_ON)
 
     def bold_off(self):
         """Turn off bold text."""
         if self.current_bold:
             self.current_bold = False
             # ESC E 0 - Turn off bold
-            self._raw(bytes([self.ESC, ord('E'), 0x00]))
+            self._raw(self.BOLD_OFF)
 
     def set_size(self, size: int):
         """Set text size using ESC/POS commands."""
@@ -1021,13 +1226,13 @@ class NamedPrinterWrapper:
             # GS ! n - Set character size
             if size == 2:
                 # Large: double width and height
-                self._raw(bytes([self.GS, ord('!'), 0x11]))
+                self._raw(self.SIZE_DOUBLE)
             elif size == 0:
                 # Small: normal size (some printers support smaller fonts)
-                self._raw(bytes([self.GS, ord('!'), 0x00]))
+                self._raw(self.SIZE_NORMAL)
             else:
                 # Normal size
-                self._raw(bytes([self.GS, ord('!'), 0x00]))
+                self._raw(self.SIZE_NORMAL)
 
     def set_font(self, font: str):
         """Set font type."""
@@ -1037,9 +1242,9 @@ class NamedPrinterWrapper:
             
             # ESC M n - Set font
             if font == 'B':
-                self._raw(bytes([self.ESC, ord('M'), 0x01]))
+                self._raw(self.FONT_B)
             else:
-                self._raw(bytes([self.ESC, ord('M'), 0x00]))
+                self._raw(self.FONT_A)
 
     def _apply_current_formatting(self):
         """Apply current formatting state (like ESP32 firmware applyCurrentFormat)."""
@@ -1144,20 +1349,14 @@ class NamedPrinterWrapper:
         for y_start in range(0, height, chunk_height):
             current_chunk_height = min(chunk_height, height - y_start)
             
-            # ESC/POS bitmap command: DC2 * height width
-            self._raw(bytes([DC2, 0x2A, current_chunk_height, bytes_per_row]))
+            # Bitmap data for this chunk
+            chunk_size = current_chunk_height * bytes_per_row
+            chunk_start = y_start * bytes_per_row
+            chunk = bytes(bitmap_data[chunk_start:chunk_start + chunk_size])
             
-            # Send bitmap data for this chunk
-            for y in range(current_chunk_height):
-                row_start = (y_start + y) * bytes_per_row
-                row_end = row_start + bytes_per_row
-                if row_end <= len(bitmap_data):
-                    self._raw(bitmap_data[row_start:row_end])
-                else:
-                    # Pad with zeros if data is insufficient
-                    remaining_data = bitmap_data[row_start:len(bitmap_data)]
-                    padding = bytes(bytes_per_row - len(remaining_data))
-                    self._raw(remaining_data + padding)
+            # ESC/POS bitmap command: DC2 * height width, then the rows
+            # (padded with zeros if data is insufficient) in a single write
+            self._raw(_pack_dc2_header(DC2, 0x2A, current_chunk_height, bytes_per_row) + chunk + bytes(chunk_size - len(chunk)))
     
     def print_solid_line(self, thickness: int = 2, width: int = 48):
         """Print solid line using bitmap graphics like ESP32 firmware."""
@@ -1167,72 +1366,96 @@ class NamedPrinterWrapper:
         bytes_per_row = 48  # 384 pixels = 48 bytes
         
         # Create solid line bitmap
-        line_data = bytes([0xFF] * (bytes_per_row * thickness))
+        line_data = b"\xff" * (bytes_per_row * thickness)
         
         # Print using bitmap command
-        self._raw(bytes([DC2, 0x2A, thickness, bytes_per_row]))
+        self._raw(_pack_dc2_header(DC2, 0x2A, thickness, bytes_per_row))
         self._raw(line_data)
         
         # Add line feed
-        self._raw(bytes([self.LF]))
+        self._raw(self.LINE_FEED)
     
     def print_dotted_line(self, dot_size: int = 2, spacing: int = 2, width: int = 48):
         """Print dotted line using bitmap graphics like ESP32 firmware."""
         DC2 = 0x12
         bytes_per_row = 48  # 384 pixels = 48 bytes
         
-        # Create dotted pattern
-        pattern_length = dot_size + spacing
-        line_data = bytearray(bytes_per_row * dot_size)
-        
-        for row in range(dot_size):
-            for col in range(bytes_per_row):
-                byte_val = 0
-                for bit in range(8):
-                    pixel_pos = (col * 8 + bit) % pattern_length
-                    if pixel_pos < dot_size:
-                        byte_val |= (0x80 >> bit)
-                line_data[row * bytes_per_row + col] = byte_val
+        # Create dotted pattern (cached per dot size/spacing)
+        line_data = create_dotted_line_bitmap(dot_size, spacing, bytes_per_row)
         
         # Print using bitmap command
-        self._raw(bytes([DC2, 0x2A, dot_size, bytes_per_row]))
-        self._raw(bytes(line_data))
+        self._raw(_pack_dc2_header(DC2, 0x2A, dot_size, bytes_per_row))
+        self._raw(line_data)
         
         # Add line feed
-        self._raw(bytes([self.LF]))
+        self._raw(self.LINE_FEED)
     
     def feed(self, lines: int = 1):
         """Feed paper by specified number of lines."""
-        for _ in range(lines):
-            self._raw(bytes([self.LF]))
+        self._raw(self.LINE_FEED * lines)
 
     def cut(self):
         """Cut paper using single clean cut command."""
-        # Add space before cutting
-        self._raw(bytes([self.LF, self.LF, self.LF]))
-        
-        # Single clean cut command - GS V 0 (Full cut)
-        self._raw(bytes([self.GS, ord('V'), 0x00]))
-        
-        # Small space after cut
-        self._raw(bytes([self.LF, self.LF]))
+        # Add space before cutting, then a single cut command:
+        # GS V 1 (partial cut) or GS V 0 (full cut)
+        cut_command = self.CUT_PARTIAL if self.cut_mode == 'partial' else self.CUT_FULL
+        self._raw(self.LINE_FEED * 3 + cut_command)
 
     def _raw(self, data: bytes):
         """Send raw data to printer buffer."""
         if not hasattr(self, '_buffer'):
-            self._buffer = b""
-        self._buffer += data
+            self._buffer = bytearray()
+        self._buffer.extend(data)
+
+    def _submit_cups(self, data: bytes) -> int:
+        """
+        Submit a print job through the shared pycups connection.
+
+        Args:
+            data: Raw job data
+
+        Returns:
+            CUPS job ID
+        """
+        def submit(conn):
+            job_id = conn.createJob(self.printer_name, "Receipt", {})
+            try:
+                conn.startDocument(self.printer_name, job_id, "receipt", cups.CUPS_FORMAT_AUTO, 1)
+                conn.writeRequestData(data, len(data))
+                conn.finishDocument(self.printer_name)
+            except Exception:
+                # Don't leave a half-open job queued; the caller falls back to lp
+                try:
+                    conn.cancelJob(job_id)
+                except Exception as e:
+                    logger.debug(f"🔍 CUPS job cancel failed: {str(e)}", job_id=job_id)
+                raise
+            return job_id
+
+        return _with_cups_connection(submit)
 
     def close(self):
         """Send buffered data to printer and close."""
         if hasattr(self, '_buffer') and self._buffer:
+            data = bytes(self._buffer)
+
+            # Submit in-process through pycups when available (no lp fork per job)
+            if cups is not None:
+                try:
+                    job_id = self._submit_cups(data)
+                    logger.info(f"✅ Print job sent to printer: {self.printer_name}", job_id=job_id)
+                    self._buffer = bytearray()
+                    return
+                except Exception as e:
+                    logger.debug(f"🔍 CUPS job submission failed, falling back to lp: {str(e)}")
+
             try:
                 # Send to printer via lp command
                 process = subprocess.Popen(['lp', '-d', self.printer_name],
                                          stdin=subprocess.PIPE)
-                process.communicate(input=self._buffer)
+                process.communicate(input=data)
                 logger.info(f"✅ Print job sent to printer: {self.printer_name}")
-                self._buffer = b""
+                self._buffer = bytearray()
             except Exception as e:
                 logger.error(f"❌ lp print error: {str(e)}")
                 raise
@@ -8,11 +8,20 @@ from qrcode.constants import ERROR_CORRECT_L, ERROR_CORRECT_M, ERROR_CORRECT_Q,
 from PIL import Image
 from typing import Dict, Any, List, Optional, Tuple
 import io
+import math
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; pure-Python fallbacks are used without it
+    np = None
 
 from .config import config
 from .utils.logger import logger
 from .utils.bitmap import encode_pixel_array_to_bitmap, analyze_bitmap_density
 
+# Pixel dimensions indexed by QR size (0-16): small, medium, large, extra large, maximum
+_SIZE_TO_PIXELS = (64,) * 4 + (96,) * 3 + (128,) * 4 + (160,) * 2 + (192,) * 4
+
 
 class QRGenerator:
     """QR code generator with ESP32 firmware compatibility."""
@@ -109,16 +118,8 @@ class QRGenerator:
         Map QR size (1-16) to pixel dimensions.
         Compatible with ESP32 firmware size mapping.
         """
-        if size <= 3:
-            return 64   # Small
-        elif size <= 6:
-            return 96   # Medium
-        elif size <= 10:
-            return 128  # Large
-        elif size <= 12:
-            return 160  # Extra Large
-        else:
-            return 192  # Maximum
+        # ceil() keeps the "size <= n" thresholds exact for fractional sizes
+        return _SIZE_TO_PIXELS[min(max(math.ceil(size), 0), 16)]
 
     def _image_to_bitmap(self, img: Image.Image) -> List[int]:
         """
@@ -134,6 +135,10 @@ class QRGenerator:
         if img.mode != 'L':
             img = img.convert('L')
 
+        if np is not None:
+            # Threshold and pack 8 pixels per byte (MSB first, rows zero-padded) in one pass
+            return np.packbits(np.asarray(img, dtype=np.uint8) < 128, axis=1).ravel().tolist()
+
         # Get pixel data
         pixels = list(img.getdata())
 
@@ -3,10 +3,74 @@ Bitmap processing utilities for SD MQTT Printer Mac client.
 Handles QR code bitmap conversion and thermal printer bitmap processing.
 """
 
+from functools import lru_cache
 from typing import List, Tuple
 from PIL import Image
 import io
 
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; pure-Python fallbacks are used without it
+    np = None
+
+# Single-bit masks by pixel position within a byte (MSB first)
+_MSB_BIT = (0x80, 0x40, 0x20, 0x10, 0x08, 0x04, 0x02, 0x01)
+
+
+@lru_cache(maxsize=1)
+def _load_bitmap_jit():
+    """
+    Import the Numba kernels on first use, so importing this module stays cheap.
+
+    Returns:
+        The bitmap_jit module, or None if Numba (or NumPy) is not installed
+    """
+    try:
+        from . import bitmap_jit
+    except ImportError:  # Numba is optional; the NumPy/pure-Python paths are used without it
+        return None
+    return bitmap_jit
+
+
+def _padded_bitmap_array(data, length: int):
+    """
+    Copy bit-packed bitmap data into a zero-padded uint8 NumPy array.
+
+    Args:
+        data: Bit-packed bitmap data (list of ints or bytes-like)
+        length: Expected data length in bytes; shorter data is padded with zeros
+
+    Returns:
+        uint8 array of exactly length bytes
+    """
+    packed = np.zeros(length, dtype=np.uint8)
+    if isinstance(data, (bytes, bytearray)):
+        chunk = np.frombuffer(data, dtype=np.uint8, count=min(len(data), length))
+    else:
+        # Only the low 8 bits of each value carry pixels
+        chunk = np.asarray(data[:length], dtype=np.int64) & 0xFF
+    packed[:len(chunk)] = chunk
+    return packed
+
+
+def _transpose8(tile: int) -> int:
+    """
+    Transpose an 8x8 bit matrix packed into a 64-bit integer (Hacker's Delight).
+
+    Args:
+        tile: Eight row bytes, first row in the most significant byte
+
+    Returns:
+        Eight column bytes in the same layout
+    """
+    t = (tile ^ (tile >> 7)) & 0x00AA00AA00AA00AA
+    tile ^= t ^ (t << 7)
+    t = (tile ^ (tile >> 14)) & 0x0000CCCC0000CCCC
+    tile ^= t ^ (t << 14)
+    t = (tile ^ (tile >> 28)) & 0x00000000F0F0F0F0
+    tile ^= t ^ (t << 28)
+    return tile
+
 
 def decode_bit_packed_bitmap(data: List[int], width: int, height: int) -> List[int]:
     """
@@ -20,17 +84,28 @@ def decode_bit_packed_bitmap(data: List[int], width: int, height: int) -> List[i
     Returns:
         List of pixel values (0=black, 255=white)
     """
-    pixels = []
     bytes_per_row = (width + 7) // 8
 
+    bitmap_jit = _load_bitmap_jit()
+    if bitmap_jit is not None:
+        padded = _padded_bitmap_array(data, bytes_per_row * height)
+        return bitmap_jit.decode_bit_packed_bitmap_kernel(padded, width, height).tolist()
+
+    if np is not None:
+        # Missing bytes decode as white, like the out-of-bounds case below
+        rows = _padded_bitmap_array(data, bytes_per_row * height).reshape(height, bytes_per_row)
+        bits = np.unpackbits(rows, axis=1)[:, :width]
+        return np.where(bits, 0, 255).ravel().tolist()
+
+    pixels = []
+
     for y in range(height):
         for x in range(width):
             byte_index = y * bytes_per_row + (x // 8)
-            bit_index = 7 - (x % 8)  # MSB first
 
             if byte_index < len(data):
                 byte_value = data[byte_index]
-                is_black = (byte_value & (1 << bit_index)) != 0
+                is_black = (byte_value & _MSB_BIT[x % 8]) != 0
                 pixels.append(0 if is_black else 255)
             else:
                 pixels.append(255)  # Default to white if out of bounds
@@ -50,6 +125,18 @@ def encode_pixel_array_to_bitmap(pixels: List[int], width: int, height: int) ->
     Returns:
         Bit-packed bitmap data
     """
+    bitmap_jit = _load_bitmap_jit()
+    if bitmap_jit is not None:
+        values = np.asarray(pixels[:width * height], dtype=np.float64)
+        return bitmap_jit.encode_pixel_array_kernel(values, width, height).tolist()
+
+    if np is not None:
+        # Missing pixels stay white; packbits pads each row to a whole byte
+        black = np.zeros(width * height, dtype=bool)
+        values = np.asarray(pixels[:width * height])
+        black[:values.size] = values < 128  # Threshold at 128
+        return np.packbits(black.reshape(height, width), axis=1).ravel().tolist()
+
     bytes_per_row = (width + 7) // 8
     bitmap_data = [0] * (bytes_per_row * height)
 
@@ -61,8 +148,7 @@ def encode_pixel_array_to_bitmap(pixels: List[int], width: int, height: int) ->
 
                 if is_black:
                     byte_index = y * bytes_per_row + (x // 8)
-                    bit_index = 7 - (x % 8)  # MSB first
-                    bitmap_data[byte_index] |= (1 << bit_index)
+                    bitmap_data[byte_index] |= _MSB_BIT[x % 8]
 
     return bitmap_data
 
@@ -86,36 +172,57 @@ def convert_bitmap_to_escpos(bitmap_data: List[int], width: int, height: int) ->
 
     bytes_per_row = (width + 7) // 8
 
+    bitmap_jit = _load_bitmap_jit()
+    if bitmap_jit is not None:
+        padded = _padded_bitmap_array(bitmap_data, bytes_per_row * height)
+        return bitmap_jit.convert_bitmap_to_escpos_kernel(padded, width, height).tobytes()
+
+    if np is not None:
+        # Unpack to a (height, width) pixel grid padded to whole 8-row groups, then
+        # pack each group's column vertically (top row in the LSB) in one call
+        groups = (height + 7) // 8
+        rows = _padded_bitmap_array(bitmap_data, bytes_per_row * height).reshape(height, bytes_per_row)
+        bits = np.zeros((groups * 8, width), dtype=np.uint8)
+        bits[:height] = np.unpackbits(rows, axis=1)[:, :width]
+        columns = np.packbits(bits.reshape(groups, 8, width), axis=1, bitorder='little')[:, 0, :]
+
+        # One line per group: ESC * 0 nL nH, column bytes, LF
+        command = np.empty((groups, width + 6), dtype=np.uint8)
+        command[:, :5] = (0x1B, 0x2A, 0, width & 0xFF, (width >> 8) & 0xFF)
+        command[:, 5:-1] = columns
+        command[:, -1] = 0x0A
+        return command.tobytes()
+
+    # Without NumPy, transpose 8x8 bit tiles with SWAR shifts on a 64-bit int.
+    # Copy the data into whole 8-row groups, with missing bytes as zeros.
+    groups = (height + 7) // 8
+    size = bytes_per_row * height
+    padded = bytearray(bytes_per_row * groups * 8)
+    if isinstance(bitmap_data, (bytes, bytearray)):
+        source = bitmap_data[:size]
+    else:
+        source = bytes(value & 0xFF for value in bitmap_data[:size])
+    padded[:len(source)] = source
+
     # Build ESC/POS command
     command = bytearray()
+    tile_stride = 8 * bytes_per_row
 
     # Process bitmap row by row (8 dots high per command)
-    for row_group in range(0, height, 8):
-        rows_in_group = min(8, height - row_group)
-
+    for row_group in range(groups):
         # ESC * command
         command.extend(b'\x1B*')  # ESC *
         command.append(0)         # Single-density mode
         command.append(width & 0xFF)      # nL (width low byte)
         command.append((width >> 8) & 0xFF)  # nH (width high byte)
 
-        # Process each column
-        for col in range(width):
-            column_byte = 0
-
-            # Pack 8 vertical pixels into one byte
-            for bit in range(rows_in_group):
-                row = row_group + bit
-                if row < height:
-                    byte_index = row * bytes_per_row + (col // 8)
-                    bit_index = 7 - (col % 8)
-
-                    if byte_index < len(bitmap_data):
-                        pixel_is_black = (bitmap_data[byte_index] & (1 << bit_index)) != 0
-                        if pixel_is_black:
-                            column_byte |= (1 << bit)
-
-            command.append(column_byte)
+        base = row_group * tile_stride
+        for col_byte in range(bytes_per_row):
+            start = base + col_byte
+            # One byte per row, read little-endian so the top row lands in the low byte
+            tile = _transpose8(int.from_bytes(padded[start:start + tile_stride:bytes_per_row], 'little'))
+            # Transposed bytes are this tile's 8 columns, left to right, top row in the LSB
+            command.extend(tile.to_bytes(8, 'big')[:width - col_byte * 8])
 
         # Line feed after each row group
         command.extend(b'\x0A')  # LF
@@ -139,6 +246,13 @@ def scale_bitmap(bitmap_data: List[int], width: int, height: int, scale_factor:
     new_width = width * scale_factor
     new_height = height * scale_factor
 
+    bitmap_jit = _load_bitmap_jit()
+    if bitmap_jit is not None and isinstance(scale_factor, int) and scale_factor > 0:
+        # Scale the packed rows directly, without materializing pixel lists
+        padded = _padded_bitmap_array(bitmap_data, ((width + 7) // 8) * height)
+        scaled = bitmap_jit.scale_bitmap_kernel(padded, width, height, scale_factor)
+        return scaled.tolist(), new_width, new_height
+
     # Decode original bitmap to pixels
     pixels = decode_bit_packed_bitmap(bitmap_data, width, height)
 
@@ -171,6 +285,14 @@ def create_test_bitmap(width: int = 64, height: int = 64) -> List[int]:
     Returns:
         Test bitmap data
     """
+    if np is not None:
+        ys, xs = np.ogrid[:height, :width]
+        border = (xs == 0) | (xs == width - 1) | (ys == 0) | (ys == height - 1)
+        diagonals = (xs == ys) | (xs == width - 1 - ys)
+        checkerboard = ((width // 4 < xs) & (xs < 3 * width // 4) & (height // 4 < ys) & (ys < 3 * height // 4)
+                        & ((xs // 4 + ys // 4) % 2 == 0))
+        return np.packbits(border | diagonals | checkerboard, axis=1).ravel().tolist()
+
     pixels = []
 
     for y in range(height):
@@ -193,6 +315,38 @@ def create_test_bitmap(width: int = 64, height: int = 64) -> List[int]:
     return encode_pixel_array_to_bitmap(pixels, width, height)
 
 
+@lru_cache(maxsize=16)
+def create_dotted_line_bitmap(dot_size: int, spacing: int, bytes_per_row: int) -> bytes:
+    """
+    Create raster data for a dotted line.
+    Results are cached since receipts reuse a handful of line patterns.
+
+    Args:
+        dot_size: Dot length and line thickness in pixels
+        spacing: Gap between dots in pixels
+        bytes_per_row: Row width in bytes (8 pixels per byte)
+
+    Returns:
+        Bit-packed raster data, dot_size rows of bytes_per_row bytes
+    """
+    pattern_length = dot_size + spacing
+
+    if 8 % pattern_length == 0:
+        # Pattern period divides a byte, so every byte of the row is identical
+        byte_val = sum(_MSB_BIT[bit] for bit in range(8) if bit % pattern_length < dot_size)
+        row = bytes([byte_val]) * bytes_per_row
+    elif np is not None:
+        bits = np.arange(bytes_per_row * 8) % pattern_length < dot_size
+        row = np.packbits(bits).tobytes()
+    else:
+        row = bytes(
+            sum(_MSB_BIT[bit] for bit in range(8) if (col * 8 + bit) % pattern_length < dot_size)
+            for col in range(bytes_per_row)
+        )
+
+    return row * dot_size
+
+
 def bitmap_to_pil_image(bitmap_data: List[int], width: int, height: int) -> Image.Image:
     """
     Convert bitmap data to PIL Image for debugging/preview.
@@ -226,34 +380,49 @@ def analyze_bitmap_density(bitmap_data: List[int], width: int, height: int) -> d
     Returns:
         Dictionary with analysis results
     """
-    pixels = decode_bit_packed_bitmap(bitmap_data, width, height)
-
-    black_pixels = sum(1 for p in pixels if p < 128)
-    white_pixels = len(pixels) - black_pixels
-
-    black_percentage = (black_pixels / len(pixels)) * 100
-
     # Analyze different regions
     center_x, center_y = width // 2, height // 2
     quarter_size = min(width, height) // 4
-
-    # Center region
-    center_black = 0
-    center_total = 0
-    for y in range(max(0, center_y - quarter_size), min(height, center_y + quarter_size)):
-        for x in range(max(0, center_x - quarter_size), min(width, center_x + quarter_size)):
-            pixel_index = y * width + x
-            if pixel_index < len(pixels):
-                center_total += 1
-                if pixels[pixel_index] < 128:
-                    center_black += 1
+    y_range = (max(0, center_y - quarter_size), min(height, center_y + quarter_size))
+    x_range = (max(0, center_x - quarter_size), min(width, center_x + quarter_size))
+
+    if np is not None:
+        # Count set (black) bits straight from the packed rows
+        bytes_per_row = (width + 7) // 8
+        rows = _padded_bitmap_array(bitmap_data, bytes_per_row * height).reshape(height, bytes_per_row)
+        black = np.unpackbits(rows, axis=1)[:, :width]
+        total_pixels = width * height
+        black_pixels = int(black.sum())
+
+        # Center region
+        center = black[y_range[0]:y_range[1], x_range[0]:x_range[1]]
+        center_black = int(center.sum())
+        center_total = center.size
+    else:
+        pixels = decode_bit_packed_bitmap(bitmap_data, width, height)
+        total_pixels = len(pixels)
+        black_pixels = sum(1 for p in pixels if p < 128)
+
+        # Center region
+        center_black = 0
+        center_total = 0
+        for y in range(*y_range):
+            for x in range(*x_range):
+                pixel_index = y * width + x
+                if pixel_index < len(pixels):
+                    center_total += 1
+                    if pixels[pixel_index] < 128:
+                        center_black += 1
+
+    white_pixels = total_pixels - black_pixels
+    black_percentage = (black_pixels / total_pixels) * 100
 
     center_density = (center_black / center_total * 100) if center_total > 0 else 0
 
     return {
         "width": width,
         "height": height,
-        "total_pixels": len(pixels),
+        "total_pixels": total_pixels,
         "black_pixels": black_pixels,
         "white_pixels": white_pixels,
         "black_percentage": black_percentage,
@@ -0,0 +1,139 @@
+"""
+Numba-compiled bitmap kernels for SD MQTT Printer Mac client.
+Imported optionally by bitmap.py; requires NumPy and Numba.
+"""
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True)
+def convert_bitmap_to_escpos_kernel(bitmap: np.ndarray, width: int, height: int) -> np.ndarray:
+    """
+    Build ESC * column-format commands from bit-packed bitmap data.
+
+    Args:
+        bitmap: uint8 bitmap data, exactly height rows of (width + 7) // 8 bytes
+        width: Bitmap width in pixels
+        height: Bitmap height in pixels
+
+    Returns:
+        uint8 array of ESC/POS command bytes
+    """
+    bytes_per_row = (width + 7) // 8
+    groups = (height + 7) // 8
+    out = np.empty(groups * (width + 6), dtype=np.uint8)
+    idx = 0
+
+    for group in range(groups):
+        # ESC * 0 nL nH
+        out[idx] = 0x1B
+        out[idx + 1] = 0x2A
+        out[idx + 2] = 0
+        out[idx + 3] = width & 0xFF
+        out[idx + 4] = (width >> 8) & 0xFF
+        idx += 5
+
+        rows_in_group = min(8, height - group * 8)
+        for col in range(width):
+            mask = 0x80 >> (col & 7)
+            offset = group * 8 * bytes_per_row + (col >> 3)
+            column_byte = 0
+            # Pack 8 vertical pixels into one byte, top row in the LSB
+            for bit in range(rows_in_group):
+                if bitmap[offset + bit * bytes_per_row] & mask:
+                    column_byte |= 1 << bit
+            out[idx] = column_byte
+            idx += 1
+
+        out[idx] = 0x0A  # LF
+        idx += 1
+
+    return out
+
+
+@njit(cache=True, boundscheck=False)
+def decode_bit_packed_bitmap_kernel(bitmap: np.ndarray, width: int, height: int) -> np.ndarray:
+    """
+    Decode bit-packed bitmap data to pixel values.
+
+    Args:
+        bitmap: uint8 bitmap data, exactly height rows of (width + 7) // 8 bytes
+        width: Bitmap width in pixels
+        height: Bitmap height in pixels
+
+    Returns:
+        uint8 array of width * height pixels (0=black, 255=white)
+    """
+    bytes_per_row = (width + 7) // 8
+    pixels = np.empty(width * height, dtype=np.uint8)
+
+    for y in range(height):
+        row = y * bytes_per_row
+        for x in range(width):
+            if bitmap[row + (x >> 3)] & (0x80 >> (x & 7)):
+                pixels[y * width + x] = 0
+            else:
+                pixels[y * width + x] = 255
+
+    return pixels
+
+
+@njit(cache=True, boundscheck=False)
+def encode_pixel_array_kernel(pixels: np.ndarray, width: int, height: int) -> np.ndarray:
+    """
+    Encode pixel values to bit-packed bitmap data.
+
+    Args:
+        pixels: float64 pixel values, at most width * height (missing pixels stay white)
+        width: Bitmap width in pixels
+        height: Bitmap height in pixels
+
+    Returns:
+        uint8 array of height rows of (width + 7) // 8 bytes
+    """
+    bytes_per_row = (width + 7) // 8
+    bitmap = np.zeros(bytes_per_row * height, dtype=np.uint8)
+
+    for i in range(min(pixels.size, width * height)):
+        if pixels[i] < 128:  # Threshold at 128
+            y = i // width
+            x = i - y * width
+            bitmap[y * bytes_per_row + (x >> 3)] |= 0x80 >> (x & 7)
+
+    return bitmap
+
+
+@njit(cache=True, boundscheck=False)
+def scale_bitmap_kernel(bitmap: np.ndarray, width: int, height: int, scale_factor: int) -> np.ndarray:
+    """
+    Scale bit-packed bitmap data by an integer factor without unpacking it.
+
+    Args:
+        bitmap: uint8 bitmap data, exactly height rows of (width + 7) // 8 bytes
+        width: Original width in pixels
+        height: Original height in pixels
+        scale_factor: Positive integer scale factor
+
+    Returns:
+        uint8 array of scaled bitmap data (height * scale_factor rows)
+    """
+    bytes_per_row = (width + 7) // 8
+    new_width = width * scale_factor
+    new_bytes_per_row = (new_width + 7) // 8
+    out = np.zeros(new_bytes_per_row * height * scale_factor, dtype=np.uint8)
+
+    for y in range(height):
+        src = y * bytes_per_row
+        dst = y * scale_factor * new_bytes_per_row
+        for x in range(new_width):
+            orig_x = x // scale_factor
+            if bitmap[src + (orig_x >> 3)] & (0x80 >> (orig_x & 7)):
+                out[dst + (x >> 3)] |= 0x80 >> (x & 7)
+
+        # Remaining rows of this source row are copies of the first
+        for repeat in range(1, scale_factor):
+            start = dst + repeat * new_bytes_per_row
+            out[start:start + new_bytes_per_row] = out[dst:dst + new_bytes_per_row]
+
+    return out
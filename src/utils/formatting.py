@@ -3,8 +3,34 @@ Text formatting utilities for SD MQTT Printer Mac client.
 Handles ESP32 firmware format compatibility and text processing.
 """
 
+import re
+from functools import lru_cache
 from typing import Dict, Any, Optional
 
+# Template placeholder: {{variable_name}}
+_VAR_RE = re.compile(r"\{\{([a-zA-Z_][a-zA-Z0-9_]*)\}\}")
+
+# Standard template variables and their defaults when missing from receipt data
+_TEMPLATE_DEFAULTS = {
+    "business_name": "",
+    "business_address": "",
+    "business_street": "",
+    "business_unit": "",
+    "business_city": "",
+    "business_state": "",
+    "business_country": "",
+    "business_postal_code": "",
+    "business_phone": "",
+    "order_id": "",
+    "customer_name": "",
+    "customer_phone": "",
+    "total_amount": "0.00",
+    "order_time": "",
+    "selected_screen": "",
+    "show_time": "",
+    "seat_number": "",
+}
+
 
 class PrinterFormatter:
     """
@@ -12,6 +38,18 @@ class PrinterFormatter:
     Maintains state for alignment, bold, size, etc.
     """
 
+    __slots__ = ("current_align", "current_bold", "current_size",
+                 "current_italic", "current_underline")
+
+    # String values accepted as true for boolean format fields
+    _TRUTHY = frozenset(("true", "1", "yes", "on"))
+
+    # Accepted alignment codes (either case) -> normalized code
+    _ALIGN_CODES = {"l": "L", "L": "L", "c": "C", "C": "C", "r": "R", "R": "R"}
+
+    # Alignment -> str padding method used by format_text_for_alignment
+    _ALIGN_FUNCS = {"L": str.ljust, "C": str.center, "R": str.rjust}
+
     def __init__(self):
         self.reset_formatting()
 
@@ -41,55 +79,77 @@ class PrinterFormatter:
         if "f" not in format_obj:
             return {}
 
-        fmt = format_obj["f"]
         changes = {}
+        handlers = self._FORMAT_HANDLERS
 
-        # Handle alignment
-        if "a" in fmt:
-            align = fmt["a"].upper()
-            if align in ["L", "C", "R"]:
-                if align != self.current_align:
-                    self.current_align = align
-                    changes["align"] = align
-
-        # Handle bold
-        if "b" in fmt:
-            bold = self._parse_bool(fmt["b"])
-            if bold != self.current_bold:
-                self.current_bold = bold
-                changes["bold"] = bold
-
-        # Handle size
-        if "s" in fmt:
-            size = int(fmt["s"])
-            if size != self.current_size:
-                self.current_size = size
-                changes["size"] = size
-
-        # Handle italic
-        if "i" in fmt:
-            italic = self._parse_bool(fmt["i"])
-            if italic != self.current_italic:
-                self.current_italic = italic
-                changes["italic"] = italic
-
-        # Handle underline
-        if "u" in fmt:
-            underline = self._parse_bool(fmt["u"])
-            if underline != self.current_underline:
-                self.current_underline = underline
-                changes["underline"] = underline
+        # Dispatch only the keys present in this format object
+        for key, value in format_obj["f"].items():
+            handler = handlers.get(key)
+            if handler is not None:
+                change = handler(self, value)
+                if change is not None:
+                    changes[change[0]] = change[1]
 
         return changes
 
+    def _apply_align(self, value: Any) -> Optional[tuple]:
+        """Apply alignment (l/c/r); returns (change key, value) or None."""
+        align = self._ALIGN_CODES.get(value)
+        if align is not None and align != self.current_align:
+            self.current_align = align
+            return "align", align
+        return None
+
+    def _apply_bold(self, value: Any) -> Optional[tuple]:
+        """Apply bold; returns (change key, value) or None."""
+        bold = self._parse_bool(value)
+        if bold != self.current_bold:
+            self.current_bold = bold
+            return "bold", bold
+        return None
+
+    def _apply_size(self, value: Any) -> Optional[tuple]:
+        """Apply size (0/1/2); returns (change key, value) or None."""
+        size = int(value)
+        if size != self.current_size:
+            self.current_size = size
+            return "size", size
+        return None
+
+    def _apply_italic(self, value: Any) -> Optional[tuple]:
+        """Apply italic; returns (change key, value) or None."""
+        italic = self._parse_bool(value)
+        if italic != self.current_italic:
+            self.current_italic = italic
+            return "italic", italic
+        return None
+
+    def _apply_underline(self, value: Any) -> Optional[tuple]:
+        """Apply underline; returns (change key, value) or None."""
+        underline = self._parse_bool(value)
+        if underline != self.current_underline:
+            self.current_underline = underline
+            return "underline", underline
+        return None
+
+    # Format object key -> handler
+    _FORMAT_HANDLERS = {
+        "a": _apply_align,
+        "b": _apply_bold,
+        "s": _apply_size,
+        "i": _apply_italic,
+        "u": _apply_underline,
+    }
+
     def _parse_bool(self, value: Any) -> bool:
         """Parse boolean value from various formats."""
-        if isinstance(value, bool):
+        value_type = type(value)
+        if value_type is bool:
             return value
-        elif isinstance(value, int):
+        elif value_type is int:
             return value != 0
-        elif isinstance(value, str):
-            return value.lower() in ["true", "1", "yes", "on"]
+        elif value_type is str:
+            return value.lower() in self._TRUTHY
         else:
             return False
 
@@ -111,12 +171,7 @@ class PrinterFormatter:
             text: Text to format
             width: Line width in characters (default 48 for 80mm printer)
         """
-        if self.current_align == 'C':
-            return text.center(width)
-        elif self.current_align == 'R':
-            return text.rjust(width)
-        else:  # 'L' or default
-            return text.ljust(width)
+        return self._ALIGN_FUNCS.get(self.current_align, str.ljust)(text, width)
 
 
 def parse_line_command(line_obj: Dict[str, Any]) -> Dict[str, Any]:
@@ -153,6 +208,54 @@ def parse_line_command(line_obj: Dict[str, Any]) -> Dict[str, Any]:
         return {"type": "solid", "thickness": 2, "width": 48, "spacing": 2}
 
 
+def _qr_url_data(url: Any, size: Any = 10, alignment: Any = "center") -> Dict[str, Any]:
+    """Build parsed QR data for a URL/text QR code."""
+    return {"type": "url", "url": url, "size": size, "alignment": alignment}
+
+
+def _parse_qr_bitmap(qr_obj: Dict[str, Any]) -> Dict[str, Any]:
+    """Parse bitmap format: {"qr_bitmap": {...}}."""
+    bitmap = qr_obj["qr_bitmap"]
+    return {
+        "type": "bitmap",
+        "width": bitmap.get("width", 96),
+        "height": bitmap.get("height", 96),
+        "data": bitmap.get("data", []),
+        "encoding": bitmap.get("encoding", "bitmap_1bit_packed"),
+        "size": qr_obj.get("qr_size", 10),
+        "alignment": qr_obj.get("qr_alignment", "center")
+    }
+
+
+def _parse_qr_url(qr_obj: Dict[str, Any]) -> Dict[str, Any]:
+    """Parse URL format: {"qr_url": "...", "qr_size": 10, "qr_alignment": "center"}."""
+    return _qr_url_data(qr_obj["qr_url"],
+                        qr_obj.get("qr_size", 10),
+                        qr_obj.get("qr_alignment", "center"))
+
+
+def _parse_qr_legacy(qr_obj: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Parse legacy format: {"qr": "..."} or {"qr": {"text"|"url": "..."}}."""
+    qr_content = qr_obj["qr"]
+    if isinstance(qr_content, str):
+        return _qr_url_data(qr_content)
+    if isinstance(qr_content, dict):
+        # Legacy structured format
+        if "text" in qr_content:
+            return _qr_url_data(qr_content["text"])
+        if "url" in qr_content:
+            return _qr_url_data(qr_content["url"])
+    return None
+
+
+# QR formats in priority order: (key, parser)
+_QR_PARSERS = (
+    ("qr_bitmap", _parse_qr_bitmap),
+    ("qr_url", _parse_qr_url),
+    ("qr", _parse_qr_legacy),
+)
+
+
 def parse_qr_command(qr_obj: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """
     Parse QR code command from ESP32 firmware format.
@@ -162,60 +265,23 @@ def parse_qr_command(qr_obj: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     2. URL format: {"qr_url": "...", "qr_size": 10, "qr_alignment": "center"}
     3. Legacy format: {"qr": "..."}
     """
-    qr_data = None
-
-    # Check for bitmap format
-    if "qr_bitmap" in qr_obj:
-        bitmap = qr_obj["qr_bitmap"]
-        qr_data = {
-            "type": "bitmap",
-            "width": bitmap.get("width", 96),
-            "height": bitmap.get("height", 96),
-            "data": bitmap.get("data", []),
-            "encoding": bitmap.get("encoding", "bitmap_1bit_packed"),
-            "size": qr_obj.get("qr_size", 10),
-            "alignment": qr_obj.get("qr_alignment", "center")
-        }
+    for key, parser in _QR_PARSERS:
+        if key in qr_obj:
+            return parser(qr_obj)
+    return None
 
-    # Check for URL format
-    elif "qr_url" in qr_obj:
-        qr_data = {
-            "type": "url",
-            "url": qr_obj["qr_url"],
-            "size": qr_obj.get("qr_size", 10),
-            "alignment": qr_obj.get("qr_alignment", "center")
-        }
 
-    # Check for legacy format
-    elif "qr" in qr_obj:
-        qr_content = qr_obj["qr"]
-        if isinstance(qr_content, str):
-            qr_data = {
-                "type": "url",
-                "url": qr_content,
-                "size": 10,
-                "alignment": "center"
-            }
-        elif isinstance(qr_content, dict):
-            # Legacy structured format
-            if "text" in qr_content:
-                qr_data = {
-                    "type": "url",
-                    "url": qr_content["text"],
-                    "size": 10,
-                    "alignment": "center"
-                }
-            elif "url" in qr_content:
-                qr_data = {
-                    "type": "url",
-                    "url": qr_content["url"],
-                    "size": 10,
-                    "alignment": "center"
-                }
-
-    return qr_data
+# Prebuilt line patterns, sliced to the requested width
+_LINE_TEMPLATE_WIDTH = 128
+_LINE_TEMPLATES = {
+    "solid": "─" * _LINE_TEMPLATE_WIDTH,
+    "dotted": "·" * _LINE_TEMPLATE_WIDTH,
+    "double": "═" * _LINE_TEMPLATE_WIDTH,
+}
+_DEFAULT_LINE_TEMPLATE = "-" * _LINE_TEMPLATE_WIDTH
 
 
+@lru_cache(maxsize=64)
 def generate_line_pattern(line_type: str, width: int = 48, thickness: int = 2) -> str:
     """
     Generate line pattern for printing.
@@ -225,14 +291,10 @@ def generate_line_pattern(line_type: str, width: int = 48, thickness: int = 2) -
         width: Width in characters
         thickness: Line thickness (number of rows)
     """
-    if line_type == "solid":
-        return "─" * width
-    elif line_type == "dotted":
-        return "·" * width
-    elif line_type == "double":
-        return "═" * width
-    else:
-        return "-" * width
+    template = _LINE_TEMPLATES.get(line_type, _DEFAULT_LINE_TEMPLATE)
+    if 0 <= width <= _LINE_TEMPLATE_WIDTH:
+        return template[:width]
+    return template[0] * width
 
 
 def replace_variables(text: str, receipt_data: Dict[str, Any]) -> str:
@@ -245,35 +307,45 @@ def replace_variables(text: str, receipt_data: Dict[str, Any]) -> str:
     if not text or "{{" not in text:
         return text
 
-    # Standard variables mapping
-    variables = {
-        "business_name": receipt_data.get("business_name", ""),
-        "business_address": receipt_data.get("business_address", ""),
-        "business_street": receipt_data.get("business_street", ""),
-        "business_unit": receipt_data.get("business_unit", ""),
-        "business_city": receipt_data.get("business_city", ""),
-        "business_state": receipt_data.get("business_state", ""),
-        "business_country": receipt_data.get("business_country", ""),
-        "business_postal_code": receipt_data.get("business_postal_code", ""),
-        "business_phone": receipt_data.get("business_phone", ""),
-        "order_id": receipt_data.get("order_id", ""),
-        "customer_name": receipt_data.get("customer_name", ""),
-        "customer_phone": receipt_data.get("customer_phone", ""),
-        "total_amount": receipt_data.get("total_amount", "0.00"),
-        "order_time": receipt_data.get("order_time", ""),
-        "selected_screen": receipt_data.get("selected_screen", ""),
-        "show_time": receipt_data.get("show_time", ""),
-        "seat_number": receipt_data.get("seat_number", ""),
+    # Replace known variables in a single pass; unknown placeholders are left as-is
+    def _substitute(match):
+        name = match.group(1)
+        default = _TEMPLATE_DEFAULTS.get(name)
+        if default is None:
+            return match.group(0)
+        value = receipt_data.get(name, default)
+        # Most payload fields are already strings; only convert the rest
+        return value if type(value) is str else str(value)
+
+    return _VAR_RE.sub(_substitute, text)
+
+
+def prepare_order_variables(receipt_data: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Resolve every template variable for one order up front.
+
+    Args:
+        receipt_data: Full print data for the order
+
+    Returns:
+        Mapping of variable name to its string value, for replace_order_variables
+    """
+    return {
+        name: str(receipt_data.get(name, default))
+        for name, default in _TEMPLATE_DEFAULTS.items()
     }
 
-    # Replace variables
-    result = text
-    for var_name, var_value in variables.items():
-        placeholder = f"{{{{{var_name}}}}}"
-        if placeholder in result:
-            result = result.replace(placeholder, str(var_value))
 
-    return result
+def replace_order_variables(text: str, variables: Dict[str, str]) -> str:
+    """
+    Replace template variables using values from prepare_order_variables.
+
+    Variables format: {{variable_name}}
+    """
+    if not text or "{{" not in text:
+        return text
+
+    return _VAR_RE.sub(lambda match: variables.get(match.group(1), match.group(0)), text)
 
 
 def format_receipt_items(items: list, characters_per_line: int = 32) -> list:
@@ -301,8 +373,7 @@ def format_receipt_items(items: list, characters_per_line: int = 32) -> list:
             # Truncate item name if too long
             item_line = item_line[:available_space-3] + "..."
 
-        # Right-align price
-        line = item_line.ljust(available_space) + price_str
-        formatted_lines.append(line)
+        # Right-align price (pad and join in one format call)
+        formatted_lines.append(f"{item_line:<{max(available_space, 0)}}{price_str}")
 
     return formatted_lines
@@ -3,16 +3,91 @@ Logging utilities for SD MQTT Printer Mac client.
 Provides structured logging with file rotation and console output.
 """
 
+import atexit
 import logging
 import logging.handlers
 import sys
+import threading
+import time
+from functools import lru_cache
+from logging import DEBUG, INFO, WARNING, ERROR, CRITICAL
 from datetime import datetime
 from typing import Optional
 
 from ..config import config
 
+# Size suffix multipliers for LOG_MAX_SIZE
+_SIZE_UNITS = {'KB': 1024, 'MB': 1024 ** 2, 'GB': 1024 ** 3}
+
+# Configured log level, resolved once (unknown names fall back to INFO)
+_LOG_LEVEL = getattr(logging, config.LOG_LEVEL.upper(), logging.INFO)
+
+# File log buffering: records are written in batches, ERROR and above flush immediately
+_LOG_BUFFER_CAPACITY = 200
+_LOG_FLUSH_INTERVAL = 30.0
+
+
+@lru_cache(maxsize=8)
+def _parse_size(size_str: str) -> int:
+    """Parse size string (e.g., '10MB') to bytes."""
+    size_str = size_str.upper()
+    multiplier = _SIZE_UNITS.get(size_str[-2:])
+    if multiplier:
+        return int(size_str[:-2]) * multiplier
+    return int(size_str)
+
+
+def _schedule_flush(handler: logging.Handler, interval: float = _LOG_FLUSH_INTERVAL):
+    """Flush handler every interval seconds on a single daemon thread."""
+    def _run():
+        wait = threading.Event().wait
+        while True:
+            wait(interval)
+            handler.flush()
+
+    threading.Thread(target=_run, name="log-flush", daemon=True).start()
+
+
+class FastRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Rotating file handler that skips filesystem checks while far below maxBytes."""
+
+    def shouldRollover(self, record):
+        """Check rollover from the stream position; defer to the stdlib near the limit."""
+        if self.stream is not None and self.maxBytes > 0:
+            msg_len = len(self.format(record)) + 1
+            if self.stream.tell() + msg_len < self.maxBytes:
+                return False
+        return super().shouldRollover(record)
+
+
+class ContextFormatter(logging.Formatter):
+    """Formatter that appends structured context passed via extra={'ctx': ...}."""
+
+    # Formatted timestamp per datefmt, shared by all instances: {datefmt: (second, text)}
+    _time_cache = {}
+
+    def formatTime(self, record, datefmt=None):
+        """Format record time, calling strftime at most once per second per datefmt."""
+        second = int(record.created)
+        cached = self._time_cache.get(datefmt)
+        if cached is None or cached[0] != second:
+            text = time.strftime(datefmt or self.default_time_format, self.converter(second))
+            cached = (second, text)
+            ContextFormatter._time_cache[datefmt] = cached
+        if datefmt:
+            return cached[1]
+        return self.default_msec_format % (cached[1], record.msecs)
+
+    def formatMessage(self, record):
+        """Format record message, joining context only for emitted records."""
+        message = super().formatMessage(record)
+        ctx = getattr(record, 'ctx', None)
+        if ctx:
+            return message + " | " + " | ".join(f"{k}={v}" for k, v in ctx.items())
+        return message
+
 
-class ColoredFormatter(logging.Formatter):
+class ColoredFormatter(ContextFormatter):
     """Custom formatter with colors for console output."""
 
     # Color codes
@@ -25,11 +100,22 @@ class ColoredFormatter(logging.Formatter):
     }
     RESET = '\033[0m'
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Colored level names, built once
+        self._colored = {
+            name: f"{code}{name}{self.RESET}" for name, code in self.COLORS.items()
+        }
+
     def format(self, record):
         """Format log record with colors."""
-        if record.levelname in self.COLORS:
-            record.levelname = f"{self.COLORS[record.levelname]}{record.levelname}{self.RESET}"
-        return super().format(record)
+        levelname = record.levelname
+        record.levelname = self._colored.get(levelname, levelname)
+        try:
+            return super().format(record)
+        finally:
+            # Buffered handlers format the same record later; don't leak colors to them
+            record.levelname = levelname
 
 
 class PrinterLogger:
@@ -37,7 +123,11 @@ class PrinterLogger:
 
     def __init__(self, name: str = "printer_client"):
         self.logger = logging.getLogger(name)
-        self.logger.setLevel(getattr(logging, config.LOG_LEVEL))
+        self.logger.setLevel(_LOG_LEVEL)
+
+        # Bound stdlib methods used on every log call
+        self._is_enabled = self.logger.isEnabledFor
+        self._emit = self.logger.log
 
         # Prevent duplicate handlers
         if not self.logger.handlers:
@@ -47,120 +137,130 @@ class PrinterLogger:
         """Setup file and console handlers."""
 
         # File handler with rotation
-        file_handler = logging.handlers.RotatingFileHandler(
+        file_handler = FastRotatingFileHandler(
             config.LOG_FILE,
-            maxBytes=self._parse_size(config.LOG_MAX_SIZE),
+            maxBytes=_parse_size(config.LOG_MAX_SIZE),
             backupCount=config.LOG_BACKUP_COUNT
         )
 
-        file_formatter = logging.Formatter(
+        file_formatter = ContextFormatter(
             '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
         )
         file_handler.setFormatter(file_formatter)
 
-        # Console handler with colors
+        # Buffer file records in memory and write them out in batches
+        buffered_handler = logging.handlers.MemoryHandler(
+            capacity=_LOG_BUFFER_CAPACITY,
+            flushLevel=logging.ERROR,
+            target=file_handler,
+            flushOnClose=True
+        )
+        atexit.register(buffered_handler.flush)
+        _schedule_flush(buffered_handler)
+
+        # Console handler, colored only when attached to a terminal
         console_handler = logging.StreamHandler(sys.stdout)
-        console_formatter = ColoredFormatter(
+        is_tty = sys.stdout.isatty()
+        console_formatter = (ColoredFormatter if is_tty else ContextFormatter)(
             '%(asctime)s - %(levelname)s - %(message)s',
             datefmt='%H:%M:%S'
         )
         console_handler.setFormatter(console_formatter)
 
         # Add handlers
-        self.logger.addHandler(file_handler)
+        self.logger.addHandler(buffered_handler)
         self.logger.addHandler(console_handler)
 
-    def _parse_size(self, size_str: str) -> int:
-        """Parse size string (e.g., '10MB') to bytes."""
-        size_str = size_str.upper()
-
-        if size_str.endswith('KB'):
-            return int(size_str[:-2]) * 1024
-        elif size_str.endswith('MB'):
-            return int(size_str[:-2]) * 1024 * 1024
-        elif size_str.endswith('GB'):
-            return int(size_str[:-2]) * 1024 * 1024 * 1024
-        else:
-            return int(size_str)
+    def isEnabledFor(self, level: int) -> bool:
+        """Check whether messages at level would be emitted (to skip building them)."""
+        return self._is_enabled(level)
 
     def debug(self, message: str, **kwargs):
         """Log debug message."""
-        self.logger.debug(self._format_message(message, **kwargs))
+        self._log(DEBUG, message, kwargs)
 
     def info(self, message: str, **kwargs):
         """Log info message."""
-        self.logger.info(self._format_message(message, **kwargs))
+        self._log(INFO, message, kwargs)
 
     def warning(self, message: str, **kwargs):
         """Log warning message."""
-        self.logger.warning(self._format_message(message, **kwargs))
+        self._log(WARNING, message, kwargs)
 
     def error(self, message: str, **kwargs):
         """Log error message."""
-        self.logger.error(self._format_message(message, **kwargs))
+        self._log(ERROR, message, kwargs)
 
     def critical(self, message: str, **kwargs):
         """Log critical message."""
-        self.logger.critical(self._format_message(message, **kwargs))
+        self._log(CRITICAL, message, kwargs)
 
-    def _format_message(self, message: str, **kwargs) -> str:
-        """Format message with additional context."""
-        if kwargs:
-            context = " | ".join([f"{k}={v}" for k, v in kwargs.items()])
-            return f"{message} | {context}"
-        return message
+    def _log(self, level: int, message: str, kwargs: dict):
+        """Log message at level; context is joined by the formatter only if emitted."""
+        if self._is_enabled(level):
+            if kwargs:
+                self._emit(level, message, extra={'ctx': kwargs})
+            else:
+                self._emit(level, message)
 
     # Printer-specific logging methods
     def print_start(self, order_id: str, page: int, total_pages: int):
         """Log print job start."""
-        self.info(f"🖨️ Print started",
+        self.info("🖨️ Print started",
                  order_id=order_id,
                  page=page,
                  total_pages=total_pages)
 
     def print_complete(self, order_id: str, page: int, total_pages: int):
         """Log print job completion."""
-        self.info(f"✅ Print completed",
+        self.info("✅ Print completed",
                  order_id=order_id,
                  page=page,
                  total_pages=total_pages)
 
     def print_error(self, order_id: str, error: str):
         """Log print error."""
-        self.error(f"❌ Print error",
+        self.error("❌ Print error",
                   order_id=order_id,
                   error=error)
 
     def mqtt_connect(self, broker: str, port: int):
         """Log MQTT connection."""
-        self.info(f"🔌 MQTT connected",
+        self.info("🔌 MQTT connected",
                  broker=broker,
                  port=port)
 
     def mqtt_disconnect(self, reason: str = ""):
         """Log MQTT disconnection."""
-        self.warning(f"🔌 MQTT disconnected",
+        self.warning("🔌 MQTT disconnected",
                     reason=reason)
 
     def mqtt_message(self, topic: str, size: int):
         """Log MQTT message received."""
-        self.debug(f"📨 MQTT message",
+        if not self._is_enabled(DEBUG):
+            return
+        self.debug("📨 MQTT message",
                   topic=topic,
                   size=size)
 
     def heartbeat_sent(self, status: str):
         """Log heartbeat sent."""
-        self.debug(f"💓 Heartbeat sent",
+        if not self._is_enabled(DEBUG):
+            return
+        self.debug("💓 Heartbeat sent",
                   status=status)
 
     def qr_generated(self, url: str, size: int):
         """Log QR code generation."""
-        self.debug(f"🔲 QR generated",
-                  url=url[:50] + "..." if len(url) > 50 else url,
-                  size=size)
+        if not self._is_enabled(DEBUG):
+            return
+        short_url = url if len(url) <= 50 else url[:50] + "..."
+        self.debug("🔲 QR generated", url=short_url, size=size)
 
     def printer_status(self, status: str, details: Optional[dict] = None):
         """Log printer status."""
+        if not self._is_enabled(DEBUG):
+            return
         if details:
             self.debug(f"🖨️ Printer status: {status}", **details)
         else:
@@ -168,8 +268,27 @@ class PrinterLogger:
 
     def system_info(self, info: dict):
         """Log system information."""
-        self.info(f"💻 System info", **info)
+        self.info("💻 System info", **info)
+
+
+class _LazyLogger:
+    """Proxy that creates the global PrinterLogger on first use."""
+
+    _instance = None
+    _lock = threading.Lock()
+
+    def __getattr__(self, name):
+        """Resolve name on the real logger and cache it, so later lookups skip this hook."""
+        instance = _LazyLogger._instance
+        if instance is None:
+            with _LazyLogger._lock:
+                if _LazyLogger._instance is None:
+                    _LazyLogger._instance = PrinterLogger()
+                instance = _LazyLogger._instance
+        value = getattr(instance, name)
+        setattr(self, name, value)
+        return value
 
 
-# Global logger instance
-logger = PrinterLogger()
+# Global logger instance (handlers are set up on first log call)
+logger = _LazyLogger()
@@ -9,6 +9,8 @@ import time
 import paho.mqtt.client as mqtt
 from typing import Dict, Any
 
+from _mqtt_test_helpers import make_client
+
 # MQTT Configuration
 MQTT_BROKER = "printer.scandeer.com"
 MQTT_PORT = 1883
@@ -146,6 +148,39 @@ def create_complex_receipt() -> list:
         "End of complex test"
     ]
 
+def create_simple_receipt() -> list:
+    """
+    Create a simple receipt exercising alignment and bold changes.
+    """
+    return [
+        {"page": 1, "of": 1},
+        {"m": {"order_id": "SIMPLE-123"}},
+        {"f": {"a": "c", "b": True, "s": 2}},
+        "SIMPLE TEST",
+        {"f": {"a": "l", "b": False, "s": 1}},
+        "This should be left aligned",
+        {"f": {"a": "c", "b": False, "s": 1}},
+        "This should be center aligned",
+        {"f": {"a": "r", "b": False, "s": 1}},
+        "This should be right aligned",
+        {"f": {"a": "l", "b": True, "s": 1}},
+        "This should be bold",
+        {"f": {"a": "l", "b": False, "s": 1}},
+        "This should be normal"
+    ]
+
+# Compact JSON encoder shared by all payloads
+_ENCODE_JSON = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False).encode
+
+def _encode_receipt(receipt_data: list) -> bytes:
+    """Serialize a receipt to compact JSON bytes like the server does."""
+    return _ENCODE_JSON(receipt_data).encode('utf-8')
+
+# Test payloads, serialized once at import
+_REALISTIC_JSON = _encode_receipt(create_realistic_receipt())
+_COMPLEX_JSON = _encode_receipt(create_complex_receipt())
+_SIMPLE_JSON = _encode_receipt(create_simple_receipt())
+
 def on_connect(client, userdata, flags, rc):
     """MQTT connection callback."""
     if rc == 0:
@@ -157,18 +192,14 @@ def on_publish(client, userdata, mid):
     """MQTT publish callback."""
     print(f"📤 Message published: {mid}")
 
-def send_print_order(client: mqtt.Client, receipt_data: list, order_name: str):
-    """Send a print order to the Mac client."""
+def send_print_order(client: mqtt.Client, payload_bytes: bytes, order_name: str):
+    """Send a pre-encoded print order to the Mac client."""
     print(f"\n🖨️ Sending {order_name} to {TOPIC_PRINT}")
     
-    # Convert to JSON like the server does
-    json_payload = json.dumps(receipt_data, separators=(',', ':'))
-    
-    print(f"📄 Payload size: {len(json_payload)} bytes")
-    print(f"📄 Elements: {len(receipt_data)}")
+    print(f"📄 Payload size: {len(payload_bytes)} bytes")
     
     # Publish the message
-    result = client.publish(TOPIC_PRINT, json_payload, qos=0)
+    result = client.publish(TOPIC_PRINT, payload_bytes, qos=0)
     
     if result.rc == mqtt.MQTT_ERR_SUCCESS:
         print(f"✅ {order_name} sent successfully")
@@ -183,8 +214,7 @@ def main():
     print("=" * 50)
     
     # Create MQTT client
-    client = mqtt.Client()
-    client.username_pw_set(MQTT_USER, MQTT_PASSWORD)
+    client = make_client("", MQTT_USER, MQTT_PASSWORD)
     client.on_connect = on_connect
     client.on_publish = on_publish
     
@@ -202,8 +232,7 @@ def main():
         print("TEST 1: Realistic Receipt with QR Code")
         print("="*50)
         
-        realistic_receipt = create_realistic_receipt()
-        success1 = send_print_order(client, realistic_receipt, "Realistic Receipt")
+        success1 = send_print_order(client, _REALISTIC_JSON, "Realistic Receipt")
         
         if success1:
             print("⏱️ Waiting 10 seconds before next test...")
@@ -214,8 +243,7 @@ def main():
         print("TEST 2: Complex Formatting Test")
         print("="*50)
         
-        complex_receipt = create_complex_receipt()
-        success2 = send_print_order(client, complex_receipt, "Complex Receipt")
+        success2 = send_print_order(client, _COMPLEX_JSON, "Complex Receipt")
         
         if success2:
             print("⏱️ Waiting 5 seconds...")
@@ -226,24 +254,7 @@ def main():
         print("TEST 3: Simple Format Test")
         print("="*50)
         
-        simple_test = [
-            {"page": 1, "of": 1},
-            {"m": {"order_id": "SIMPLE-123"}},
-            {"f": {"a": "c", "b": True, "s": 2}},
-            "SIMPLE TEST",
-            {"f": {"a": "l", "b": False, "s": 1}},
-            "This should be left aligned",
-            {"f": {"a": "c", "b": False, "s": 1}},
-            "This should be center aligned",
-            {"f": {"a": "r", "b": False, "s": 1}},
-            "This should be right aligned",
-            {"f": {"a": "l", "b": True, "s": 1}},
-            "This should be bold",
-            {"f": {"a": "l", "b": False, "s": 1}},
-            "This should be normal"
-        ]
-        
-        success3 = send_print_order(client, simple_test, "Simple Test")
+        success3 = send_print_order(client, _SIMPLE_JSON, "Simple Test")
         
         # Summary
         print("\n" + "="*50)
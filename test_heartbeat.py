@@ -5,11 +5,14 @@ This will subscribe to the heartbeat topic and log all messages received.
 """
 
 import json
+import os
+import queue
 import time
 import threading
-import paho.mqtt.client as mqtt
 from datetime import datetime
 
+from _mqtt_test_helpers import make_client
+
 # Configuration
 MQTT_BROKER = "printer.scandeer.com"
 MQTT_PORT = 1883
@@ -17,6 +20,10 @@ MQTT_USERNAME = "vimal2"
 MQTT_PASSWORD = "pa55word"
 PRINTER_ID = "EE363AC5CF98"
 
+# Set PRETTY_HB=1 to parse and pretty-print JSON heartbeats
+PRETTY_HB = os.environ.get("PRETTY_HB") == "1"
+_SEPARATOR = "-" * 40
+
 # Topic to monitor
 HEARTBEAT_TOPIC = f"{MQTT_USERNAME}/pt/{PRINTER_ID}/h"
 
@@ -43,35 +50,42 @@ def on_disconnect(client, userdata, rc):
     else:
         print("🔌 Disconnected gracefully")
 
+# Received messages, printed off the MQTT network thread: (received_at, topic, payload)
+_messages = queue.Queue()
+
 def on_message(client, userdata, msg):
-    """Handle incoming MQTT messages."""
-    try:
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        topic = msg.topic
-        payload = msg.payload.decode('utf-8')
-        
-        print(f"💓 [{timestamp}] Heartbeat received on: {topic}")
-        
-        # Try to parse JSON payload
+    """Queue incoming MQTT messages for printing."""
+    _messages.put_nowait((time.time(), msg.topic, msg.payload))
+
+def _print_messages():
+    """Format and print queued heartbeat messages."""
+    while True:
+        received_at, topic, payload = _messages.get()
         try:
-            data = json.loads(payload)
-            print(f"   📊 Data: {json.dumps(data, indent=2)}")
-        except json.JSONDecodeError:
-            print(f"   📝 Raw payload: {payload}")
-        
-        print("-" * 40)
-        
-    except Exception as e:
-        print(f"❌ Message handling error: {str(e)}")
+            timestamp = datetime.fromtimestamp(received_at).strftime("%H:%M:%S")
+            payload = payload.decode('utf-8')
+            
+            print(f"💓 [{timestamp}] Heartbeat received on: {topic}")
+            
+            # Pretty-print JSON only when asked; otherwise show the payload as sent
+            if PRETTY_HB:
+                try:
+                    print(f"   📊 Data: {json.dumps(json.loads(payload), indent=2)}")
+                except json.JSONDecodeError:
+                    print(f"   📝 Raw payload: {payload}")
+            else:
+                print(f"   📝 Raw payload: {payload}")
+            
+            print(_SEPARATOR)
+            
+        except Exception as e:
+            print(f"❌ Message handling error: {str(e)}")
 
 def main():
     """Main function."""
     try:
         # Create MQTT client
-        client = mqtt.Client(client_id=f"HeartbeatMonitor-{int(time.time())}")
-        
-        # Set credentials
-        client.username_pw_set(MQTT_USERNAME, MQTT_PASSWORD)
+        client = make_client(f"HeartbeatMonitor-{int(time.time())}", MQTT_USERNAME, MQTT_PASSWORD)
         
         # Set callbacks
         client.on_connect = on_connect
@@ -81,19 +95,16 @@ def main():
         # Connect to broker
         client.connect(MQTT_BROKER, MQTT_PORT, 60)
         
-        # Start network loop
-        client.loop_start()
+        threading.Thread(target=_print_messages, daemon=True).start()
         
         print("🚀 Starting heartbeat monitor...")
         print("Press Ctrl+C to stop")
         
-        # Keep running
-        while True:
-            time.sleep(1)
+        # Run the network loop on this thread until interrupted
+        client.loop_forever(retry_first_connection=True)
             
     except KeyboardInterrupt:
         print("\n🛑 Stopping heartbeat monitor...")
-        client.loop_stop()
         client.disconnect()
         print("✅ Monitor stopped")
         
@@ -4,10 +4,11 @@ Simple MQTT connection test to verify credentials.
 """
 
 import os
-import time
-import paho.mqtt.client as mqtt
+import threading
 from dotenv import load_dotenv
 
+from _mqtt_test_helpers import make_client, loop_until
+
 # Load environment variables
 load_dotenv()
 
@@ -27,6 +28,7 @@ print("=" * 40)
 # Connection result tracking
 connection_result = None
 connection_successful = False
+connected_evt = threading.Event()  # Set once on_connect reports a result
 
 def on_connect(client, userdata, flags, rc):
     global connection_result, connection_successful
@@ -45,6 +47,7 @@ def on_connect(client, userdata, flags, rc):
         }
         print(f"❌ Connection failed: {error_messages.get(rc, f'Unknown error code {rc}')}")
         connection_successful = False
+    connected_evt.set()
 
 def on_disconnect(client, userdata, rc):
     if rc != 0:
@@ -53,31 +56,23 @@ def on_disconnect(client, userdata, rc):
         print("🔌 Disconnected gracefully")
 
 # Create client
-client = mqtt.Client(client_id="TestClient-12345")
-client.username_pw_set(MQTT_USERNAME, MQTT_PASSWORD)
+client = make_client("TestClient-12345", MQTT_USERNAME, MQTT_PASSWORD)
 client.on_connect = on_connect
 client.on_disconnect = on_disconnect
 
 try:
     print("🔄 Connecting...")
     client.connect(MQTT_BROKER, MQTT_PORT, 60)
-    client.loop_start()
-    
-    # Wait for connection result
-    timeout = 10
-    start_time = time.time()
-    
-    while connection_result is None and time.time() - start_time < timeout:
-        time.sleep(0.1)
     
-    if connection_result is None:
+    # Drive the network loop until a connection result arrives
+    if not loop_until(client, 10, connected_evt):
         print("❌ Connection timeout")
     elif connection_successful:
         print("✅ Connection test successful!")
-        time.sleep(2)  # Keep connection alive briefly
+        loop_until(client, 2)  # Keep connection alive briefly
     
-    client.loop_stop()
     client.disconnect()
+    client.loop(timeout=1.0)  # Deliver on_disconnect
     
 except Exception as e:
     print(f"❌ Connection error: {e}")
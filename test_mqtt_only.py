@@ -3,11 +3,13 @@
 Minimal MQTT test - connect and subscribe only, no publishing.
 """
 
+import threading
 import time
-import paho.mqtt.client as mqtt
 from dotenv import load_dotenv
 import os
 
+from _mqtt_test_helpers import make_client, loop_until
+
 load_dotenv()
 
 MQTT_BROKER = os.getenv("MQTT_BROKER", "printer.scandeer.com")
@@ -24,7 +26,7 @@ print(f"🆔 Client ID: {CLIENT_ID}")
 print("=" * 50)
 
 connected = False
-disconnected = False
+disconnected_evt = threading.Event()
 
 def on_connect(client, userdata, flags, rc):
     global connected
@@ -38,8 +40,7 @@ def on_connect(client, userdata, flags, rc):
         print(f"❌ Connection failed: {rc}")
 
 def on_disconnect(client, userdata, rc):
-    global disconnected
-    disconnected = True
+    disconnected_evt.set()
     if rc != 0:
         print(f"⚠️ Unexpected disconnection: {rc}")
     else:
@@ -52,8 +53,7 @@ def on_subscribe(client, userdata, mid, granted_qos):
     print(f"✅ Subscription confirmed with QoS: {granted_qos}")
 
 # Create client
-client = mqtt.Client(client_id=CLIENT_ID)
-client.username_pw_set(MQTT_USERNAME, MQTT_PASSWORD)
+client = make_client(CLIENT_ID, MQTT_USERNAME, MQTT_PASSWORD)
 client.on_connect = on_connect
 client.on_disconnect = on_disconnect
 client.on_message = on_message
@@ -62,22 +62,20 @@ client.on_subscribe = on_subscribe
 try:
     print("🔄 Connecting...")
     client.connect(MQTT_BROKER, MQTT_PORT, 60)
-    client.loop_start()
     
-    # Wait and monitor connection
+    # Drive the network loop and monitor connection for 30 seconds
     start_time = time.time()
     while time.time() - start_time < 30:  # Monitor for 30 seconds
-        if disconnected:
+        if loop_until(client, 1.0, disconnected_evt):
             print("❌ Connection lost")
             break
         if connected:
             elapsed = int(time.time() - start_time)
             print(f"⏱️  Connected for {elapsed}s", end='\r')
-        time.sleep(1)
     
     print("\n🔧 Test completed")
-    client.loop_stop()
     client.disconnect()
+    client.loop(timeout=1.0)  # Deliver on_disconnect
     
 except Exception as e:
     print(f"❌ Error: {e}") 
\ No newline at end of file
@@ -4,35 +4,49 @@ Test script to verify SD MQTT Printer Mac setup.
 Tests all components without requiring actual hardware.
 """
 
+import importlib.util
 import sys
 import traceback
 from typing import Dict, Any
 
+# Modules checked by test_imports: (module name, label)
+_IMPORT_MODULES = (
+    ("config", "Config"),
+    ("utils.logger", "Logger"),
+    ("utils.formatting", "Formatting"),
+    ("utils.bitmap", "Bitmap"),
+    ("qr_generator", "QR generator"),
+    ("printer_manager", "Printer manager"),
+    ("mqtt_client", "MQTT client"),
+)
+
+
 def test_imports():
     """Test that all modules can be imported."""
     print("🔍 Testing imports...")
 
     try:
-        from config import config
-        print("✅ Config module imported")
+        # Locate every module first without executing it
+        missing = []
+        for module_name, label in _IMPORT_MODULES:
+            if importlib.util.find_spec(module_name) is None:
+                print(f"❌ {label} module not found")
+                missing.append(module_name)
+            else:
+                print(f"✅ {label} module found")
 
-        from utils.logger import logger
-        print("✅ Logger module imported")
+        if missing:
+            return False
 
+        # All modules located; import them once for real
+        from config import config
+        from utils.logger import logger
         from utils.formatting import PrinterFormatter, replace_variables
-        print("✅ Formatting module imported")
-
         from utils.bitmap import decode_bit_packed_bitmap, analyze_bitmap_density
-        print("✅ Bitmap module imported")
-
         from qr_generator import qr_generator
-        print("✅ QR generator module imported")
-
         from printer_manager import printer_manager
-        print("✅ Printer manager module imported")
-
         from mqtt_client import mqtt_client
-        print("✅ MQTT client module imported")
+        print("✅ All modules imported")
 
         return True
 
@@ -275,35 +289,41 @@ def test_mqtt_client():
         return False
 
 
+# Setup tests in run order: (name, function)
+_TESTS = (
+    ("Imports", test_imports),
+    ("Configuration", test_config),
+    ("Logger", test_logger),
+    ("Formatting", test_formatting),
+    ("QR Generator", test_qr_generator),
+    ("Bitmap Processing", test_bitmap_processing),
+    ("Printer Manager", test_printer_manager),
+    ("MQTT Client", test_mqtt_client),
+)
+
+
 def main():
     """Run all tests."""
     print("🧪 SD MQTT Printer Mac - Setup Test")
     print("=" * 50)
 
-    tests = [
-        ("Imports", test_imports),
-        ("Configuration", test_config),
-        ("Logger", test_logger),
-        ("Formatting", test_formatting),
-        ("QR Generator", test_qr_generator),
-        ("Bitmap Processing", test_bitmap_processing),
-        ("Printer Manager", test_printer_manager),
-        ("MQTT Client", test_mqtt_client),
-    ]
-
     passed = 0
     failed = 0
+    errors = []
 
-    for test_name, test_func in tests:
+    for test_name, test_func in _TESTS:
         try:
             if test_func():
                 passed += 1
             else:
                 failed += 1
         except Exception as e:
-            print(f"❌ {test_name} test failed: {str(e)}")
+            errors.append(f"❌ {test_name} test failed: {str(e)}")
             failed += 1
 
+    if errors:
+        print("\n" + "\n".join(errors))
+
     print("\n" + "=" * 50)
     print(f"📊 Test Results: {passed} passed, {failed} failed")
 
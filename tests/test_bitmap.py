@@ -0,0 +1,63 @@
+"""
+Equivalence tests for the accelerated bitmap paths against the pure-Python implementation.
+"""
+
+import random
+
+import pytest
+
+from src.utils import bitmap
+
+# (width, height) pairs covering partial bytes and partial 8-row groups
+SIZES = [(1, 1), (8, 8), (13, 5), (64, 64), (87, 87), (100, 17)]
+
+
+def _random_bitmap(width, height, seed, short_by=0):
+    rng = random.Random(seed)
+    length = ((width + 7) // 8) * height - short_by
+    return [rng.randrange(256) for _ in range(max(0, length))]
+
+
+def _random_pixels(width, height, seed):
+    rng = random.Random(seed)
+    return [rng.choice((0, 100, 127, 128, 200, 255)) for _ in range(width * height)]
+
+
+def _calls(width, height):
+    data = _random_bitmap(width, height, seed=width * 1000 + height)
+    short = _random_bitmap(width, height, seed=height, short_by=3)
+    pixels = _random_pixels(width, height, seed=width + height)
+    return [
+        (bitmap.decode_bit_packed_bitmap, (data, width, height)),
+        (bitmap.decode_bit_packed_bitmap, (short, width, height)),
+        (bitmap.decode_bit_packed_bitmap, (bytes(data), width, height)),
+        (bitmap.encode_pixel_array_to_bitmap, (pixels, width, height)),
+        (bitmap.encode_pixel_array_to_bitmap, (pixels[:-2], width, height)),
+        (bitmap.convert_bitmap_to_escpos, (data, width, height)),
+        (bitmap.convert_bitmap_to_escpos, (short, width, height)),
+        (bitmap.scale_bitmap, (data, width, height, 2)),
+        (bitmap.scale_bitmap, (data, width, height, 3)),
+    ]
+
+
+def _pure_python(monkeypatch, func, args):
+    with monkeypatch.context() as m:
+        m.setattr(bitmap, "np", None)
+        m.setattr(bitmap, "_load_bitmap_jit", lambda: None)
+        return func(*args)
+
+
+@pytest.mark.parametrize("width,height", SIZES)
+def test_numpy_matches_pure_python(monkeypatch, width, height):
+    pytest.importorskip("numpy")
+    monkeypatch.setattr(bitmap, "_load_bitmap_jit", lambda: None)
+    for func, args in _calls(width, height):
+        assert func(*args) == _pure_python(monkeypatch, func, args), func.__name__
+
+
+@pytest.mark.parametrize("width,height", SIZES)
+def test_numba_kernels_match_pure_python(monkeypatch, width, height):
+    pytest.importorskip("numba")
+    assert bitmap._load_bitmap_jit() is not None
+    for func, args in _calls(width, height):
+        assert func(*args) == _pure_python(monkeypatch, func, args), func.__name__
@@ -0,0 +1,44 @@
+"""
+Output regression tests for USBPrinterManager receipt rendering.
+"""
+
+from src.printer_manager import NamedPrinterWrapper, USBPrinterManager
+
+
+class CapturingWrapper(NamedPrinterWrapper):
+    """Named printer wrapper that captures the job bytes instead of calling CUPS/lp."""
+
+    def close(self):
+        self.sent = bytes(self._buffer)
+        self._buffer = bytearray()
+
+
+def _print(receipt):
+    manager = USBPrinterManager()
+    manager.printer = CapturingWrapper("test_printer")
+    manager.is_connected = True
+    assert manager.print_receipt(receipt)
+    return manager.printer.sent
+
+
+def test_format_applies_to_every_line_of_first_block():
+    W = NamedPrinterWrapper
+    sent = _print([{"f": {"a": "c", "b": True, "s": 2}}, "Business", "Address"])
+
+    # ESC @ comes first, so it can't reset the format cached for the block
+    assert sent.startswith(
+        W.INIT + W.ALIGN_CENTER + W.BOLD_ON + W.SIZE_DOUBLE + b"Business\nAddress\n"
+    )
+    assert sent.count(W.INIT) == 1
+
+
+def test_qr_url_prints_through_named_printer_bitmap_command():
+    manager = USBPrinterManager()
+    manager.printer = manager._render_target = CapturingWrapper("test_printer")
+    assert manager._print_qr_url_real({"url": "https://scandeer.com/order/1"})
+    manager.printer.close()
+
+    # Named printers get the QR as a DC2 * bitmap, not a GS v 0 raster
+    sent = manager.printer.sent
+    assert sent.startswith(NamedPrinterWrapper.INIT + b"\x12*")
+    assert b"\x1dv0" not in sent